@@ -0,0 +1,644 @@
+"""initial schema
+
+Databases created before Alembic (by Base.metadata.create_all at startup)
+already hold these tables; for them this revision only moves the sales order
+payment status onto its own enum type and marks the schema as 0001, so
+'alembic upgrade head' works on both new and existing databases.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-16 20:59:05.713431
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Enum types are shared between tables (e.g. stockstatus), so they are created
+# once up front instead of implicitly with each table.
+department_enum = postgresql.ENUM('PRODUCTION', 'QUALITY', 'SALES', 'FINANCE', 'HR', 'IT', 'ADMIN', name='department', create_type=False)
+employeestatus_enum = postgresql.ENUM('ACTIVE', 'INACTIVE', 'TERMINATED', 'ON_LEAVE', name='employeestatus', create_type=False)
+userrole_enum = postgresql.ENUM('ADMIN', 'MANAGER', 'SUPERVISOR', 'OPERATOR', 'ACCOUNTANT', 'SALES', name='userrole', create_type=False)
+alerttype_enum = postgresql.ENUM('LOW_STOCK', 'EXPIRY', 'OVERSTOCK', 'QUALITY', 'FINANCIAL', 'PRODUCTION', name='alerttype', create_type=False)
+alertseverity_enum = postgresql.ENUM('LOW', 'MEDIUM', 'HIGH', 'CRITICAL', name='alertseverity', create_type=False)
+stockstatus_enum = postgresql.ENUM('IN_STOCK', 'LOW_STOCK', 'OUT_OF_STOCK', 'EXPIRED', 'NEAR_EXPIRY', name='stockstatus', create_type=False)
+leadsource_enum = postgresql.ENUM('WEBSITE', 'REFERRAL', 'COLD_CALL', 'EMAIL', 'SOCIAL_MEDIA', 'TRADE_SHOW', 'ADVERTISEMENT', name='leadsource', create_type=False)
+leadstatus_enum = postgresql.ENUM('NEW', 'CONTACTED', 'QUALIFIED', 'PROPOSAL', 'NEGOTIATION', 'CLOSED_WON', 'CLOSED_LOST', name='leadstatus', create_type=False)
+orderstatus_enum = postgresql.ENUM('PENDING', 'CONFIRMED', 'SHIPPED', 'DELIVERED', 'CANCELLED', 'PARTIAL', name='orderstatus', create_type=False)
+paymentstatus_enum = postgresql.ENUM('PENDING', 'PARTIAL', 'PAID', name='paymentstatus', create_type=False)
+qcstatus_enum = postgresql.ENUM('APPROVED', 'REJECTED', 'CONDITIONAL', name='qcstatus', create_type=False)
+qualitygrade_enum = postgresql.ENUM('A', 'B', 'C', name='qualitygrade', create_type=False)
+salesorderstatus_enum = postgresql.ENUM('PENDING', 'CONFIRMED', 'SHIPPED', 'DELIVERED', 'CANCELLED', name='salesorderstatus', create_type=False)
+salespaymentstatus_enum = postgresql.ENUM('PENDING', 'PAID', 'PARTIALLY_PAID', 'OVERDUE', name='salespaymentstatus', create_type=False)
+transactiontype_enum = postgresql.ENUM('INCOME', 'EXPENSE', name='transactiontype', create_type=False)
+paymentmethod_enum = postgresql.ENUM('CASH', 'BANK', 'CHEQUE', 'ONLINE', name='paymentmethod', create_type=False)
+wastereason_enum = postgresql.ENUM('EXPIRED', 'DAMAGED', 'CONTAMINATED', 'PRODUCTION_LOSS', 'SPILLAGE', 'OTHER', name='wastereason', create_type=False)
+paymentterms_enum = postgresql.ENUM('NET_15', 'NET_30', 'NET_45', 'NET_60', 'CASH_ON_DELIVERY', 'ADVANCE_PAYMENT', name='paymentterms', create_type=False)
+invoicestatus_enum = postgresql.ENUM('DRAFT', 'SENT', 'PAID', 'OVERDUE', 'CANCELLED', name='invoicestatus', create_type=False)
+productionstatus_enum = postgresql.ENUM('PLANNED', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED', name='productionstatus', create_type=False)
+
+ENUMS = [
+    department_enum,
+    employeestatus_enum,
+    userrole_enum,
+    alerttype_enum,
+    alertseverity_enum,
+    stockstatus_enum,
+    leadsource_enum,
+    leadstatus_enum,
+    orderstatus_enum,
+    paymentstatus_enum,
+    qcstatus_enum,
+    qualitygrade_enum,
+    salesorderstatus_enum,
+    salespaymentstatus_enum,
+    transactiontype_enum,
+    paymentmethod_enum,
+    wastereason_enum,
+    paymentterms_enum,
+    invoicestatus_enum,
+    productionstatus_enum,
+]
+
+
+def adopt_create_all_schema(bind) -> None:
+    """Bring a schema made by create_all in line with this revision
+
+    create_all named both payment status enums 'paymentstatus', so whichever
+    model was created first decided the labels of both columns.
+    """
+    if bind.dialect.name != "postgresql":
+        return  # non-native enums: nothing to rename
+    salespaymentstatus_enum.create(bind, checkfirst=True)
+    op.execute(
+        "ALTER TABLE sales_orders ALTER COLUMN payment_status TYPE salespaymentstatus USING "
+        "(CASE payment_status::text WHEN 'PARTIAL' THEN 'PARTIALLY_PAID' "
+        "ELSE payment_status::text END)::salespaymentstatus"
+    )
+    # Purchase order labels, in case the sales enum won the name
+    op.execute("ALTER TYPE paymentstatus ADD VALUE IF NOT EXISTS 'PARTIAL'")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if sa.inspect(bind).has_table('users'):
+        adopt_create_all_schema(bind)
+        return
+
+    for enum in ENUMS:
+        enum.create(bind, checkfirst=True)
+
+    op.create_table('customers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('contact', sa.String(), nullable=True),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('city', sa.String(), nullable=True),
+    sa.Column('customer_type', sa.String(), nullable=True),
+    sa.Column('credit_limit', sa.Float(), nullable=True),
+    sa.Column('outstanding_amount', sa.Float(), nullable=True),
+    sa.Column('total_purchases', sa.Float(), nullable=True),
+    sa.Column('last_order_date', sa.DateTime(), nullable=True),
+    sa.Column('payment_terms', sa.String(), nullable=True),
+    sa.Column('discount', sa.Float(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_customers_id'), 'customers', ['id'], unique=False)
+    op.create_index(op.f('ix_customers_name'), 'customers', ['name'], unique=False)
+    op.create_table('employees',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('employee_id', sa.String(), nullable=False),
+    sa.Column('first_name', sa.String(), nullable=False),
+    sa.Column('last_name', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('phone', sa.String(), nullable=True),
+    sa.Column('cnic', sa.String(), nullable=False),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('city', sa.String(), nullable=True),
+    sa.Column('department', department_enum, nullable=False),
+    sa.Column('designation', sa.String(), nullable=False),
+    sa.Column('hire_date', sa.Date(), nullable=False),
+    sa.Column('salary', sa.Float(), nullable=False),
+    sa.Column('status', employeestatus_enum, nullable=True),
+    sa.Column('manager_id', sa.Integer(), nullable=True),
+    sa.Column('emergency_contact', sa.String(), nullable=True),
+    sa.Column('emergency_phone', sa.String(), nullable=True),
+    sa.Column('bank_account', sa.String(), nullable=True),
+    sa.Column('tax_number', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['manager_id'], ['employees.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('cnic'),
+    sa.UniqueConstraint('email'),
+    sa.UniqueConstraint('employee_id')
+    )
+    op.create_index(op.f('ix_employees_id'), 'employees', ['id'], unique=False)
+    op.create_table('suppliers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('contact', sa.String(), nullable=True),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('city', sa.String(), nullable=True),
+    sa.Column('payment_terms', sa.String(), nullable=True),
+    sa.Column('rating', sa.Float(), nullable=True),
+    sa.Column('total_orders', sa.Integer(), nullable=True),
+    sa.Column('on_time_deliveries', sa.Integer(), nullable=True),
+    sa.Column('quality_score', sa.Float(), nullable=True),
+    sa.Column('credit_limit', sa.Float(), nullable=True),
+    sa.Column('outstanding_amount', sa.Float(), nullable=True),
+    sa.Column('ntn', sa.String(), nullable=True),
+    sa.Column('strn', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_suppliers_id'), 'suppliers', ['id'], unique=False)
+    op.create_index(op.f('ix_suppliers_name'), 'suppliers', ['name'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('role', userrole_enum, nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('phone', sa.String(), nullable=True),
+    sa.Column('department', sa.String(), nullable=True),
+    sa.Column('employee_id', sa.String(), nullable=True),
+    sa.Column('last_login', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('profile_picture', sa.String(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('employee_id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table('alerts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('type', alerttype_enum, nullable=False),
+    sa.Column('severity', alertseverity_enum, nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('acknowledged', sa.Boolean(), nullable=True),
+    sa.Column('acknowledged_by', sa.Integer(), nullable=True),
+    sa.Column('acknowledged_at', sa.DateTime(), nullable=True),
+    sa.Column('action_required', sa.Boolean(), nullable=True),
+    sa.Column('related_id', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['acknowledged_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_alerts_id'), 'alerts', ['id'], unique=False)
+    op.create_table('attendances',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=True),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('check_in', sa.DateTime(), nullable=True),
+    sa.Column('check_out', sa.DateTime(), nullable=True),
+    sa.Column('break_time', sa.Integer(), nullable=True),
+    sa.Column('overtime_hours', sa.Float(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_attendances_id'), 'attendances', ['id'], unique=False)
+    op.create_table('finished_products',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('sku', sa.String(), nullable=False),
+    sa.Column('quantity', sa.Float(), nullable=True),
+    sa.Column('unit', sa.String(), nullable=False),
+    sa.Column('cost_price', sa.Float(), nullable=False),
+    sa.Column('selling_price', sa.Float(), nullable=False),
+    sa.Column('category', sa.String(), nullable=True),
+    sa.Column('expiry_date', sa.DateTime(), nullable=True),
+    sa.Column('batch_number', sa.String(), nullable=False),
+    sa.Column('status', stockstatus_enum, nullable=True),
+    sa.Column('location', sa.String(), nullable=True),
+    sa.Column('production_cost', sa.Float(), nullable=True),
+    sa.Column('profit_margin', sa.Float(), nullable=True),
+    sa.Column('demand_forecast', sa.Float(), nullable=True),
+    sa.Column('actual_sales', sa.Float(), nullable=True),
+    sa.Column('overproduction', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('sku')
+    )
+    op.create_index(op.f('ix_finished_products_id'), 'finished_products', ['id'], unique=False)
+    op.create_index(op.f('ix_finished_products_name'), 'finished_products', ['name'], unique=False)
+    op.create_table('leads',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('company_name', sa.String(), nullable=False),
+    sa.Column('contact_person', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('phone', sa.String(), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('city', sa.String(), nullable=True),
+    sa.Column('industry', sa.String(), nullable=True),
+    sa.Column('source', leadsource_enum, nullable=False),
+    sa.Column('status', leadstatus_enum, nullable=True),
+    sa.Column('estimated_value', sa.Float(), nullable=True),
+    sa.Column('probability', sa.Integer(), nullable=True),
+    sa.Column('assigned_to', sa.Integer(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('next_follow_up', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['assigned_to'], ['employees.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_leads_id'), 'leads', ['id'], unique=False)
+    op.create_table('leaves',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=True),
+    sa.Column('leave_type', sa.String(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=False),
+    sa.Column('days', sa.Integer(), nullable=False),
+    sa.Column('reason', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('applied_date', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['employees.id'], ),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_leaves_id'), 'leaves', ['id'], unique=False)
+    op.create_table('payrolls',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=True),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('basic_salary', sa.Float(), nullable=False),
+    sa.Column('allowances', sa.Float(), nullable=True),
+    sa.Column('overtime_amount', sa.Float(), nullable=True),
+    sa.Column('deductions', sa.Float(), nullable=True),
+    sa.Column('tax_deduction', sa.Float(), nullable=True),
+    sa.Column('net_salary', sa.Float(), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('processed_date', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_payrolls_id'), 'payrolls', ['id'], unique=False)
+    op.create_table('purchase_orders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('order_number', sa.String(), nullable=False),
+    sa.Column('supplier_id', sa.Integer(), nullable=True),
+    sa.Column('order_date', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('expected_delivery', sa.DateTime(), nullable=True),
+    sa.Column('actual_delivery', sa.DateTime(), nullable=True),
+    sa.Column('status', orderstatus_enum, nullable=True),
+    sa.Column('items', sa.JSON(), nullable=True),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.Column('discount_amount', sa.Float(), nullable=True),
+    sa.Column('tax_amount', sa.Float(), nullable=True),
+    sa.Column('final_amount', sa.Float(), nullable=False),
+    sa.Column('payment_status', paymentstatus_enum, nullable=True),
+    sa.Column('delivery_charges', sa.Float(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['supplier_id'], ['suppliers.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('order_number')
+    )
+    op.create_index(op.f('ix_purchase_orders_id'), 'purchase_orders', ['id'], unique=False)
+    op.create_table('quality_controls',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('qc_number', sa.String(), nullable=False),
+    sa.Column('batch_number', sa.String(), nullable=False),
+    sa.Column('product_type', sa.String(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('item_name', sa.String(), nullable=False),
+    sa.Column('test_date', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('test_results', sa.JSON(), nullable=True),
+    sa.Column('overall_status', qcstatus_enum, nullable=False),
+    sa.Column('inspector', sa.String(), nullable=False),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('qc_number')
+    )
+    op.create_index(op.f('ix_quality_controls_id'), 'quality_controls', ['id'], unique=False)
+    op.create_table('raw_materials',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('supplier_id', sa.Integer(), nullable=True),
+    sa.Column('quantity', sa.Float(), nullable=True),
+    sa.Column('unit', sa.String(), nullable=False),
+    sa.Column('cost_per_unit', sa.Float(), nullable=False),
+    sa.Column('reorder_level', sa.Float(), nullable=False),
+    sa.Column('max_stock_level', sa.Float(), nullable=True),
+    sa.Column('expiry_date', sa.DateTime(), nullable=True),
+    sa.Column('batch_number', sa.String(), nullable=False),
+    sa.Column('status', stockstatus_enum, nullable=True),
+    sa.Column('location', sa.String(), nullable=True),
+    sa.Column('wastage', sa.Float(), nullable=True),
+    sa.Column('quality_grade', qualitygrade_enum, nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['supplier_id'], ['suppliers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_raw_materials_id'), 'raw_materials', ['id'], unique=False)
+    op.create_index(op.f('ix_raw_materials_name'), 'raw_materials', ['name'], unique=False)
+    op.create_table('sales_orders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('order_number', sa.String(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=True),
+    sa.Column('order_date', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('delivery_date', sa.DateTime(), nullable=True),
+    sa.Column('status', salesorderstatus_enum, nullable=True),
+    sa.Column('items', sa.JSON(), nullable=True),
+    sa.Column('subtotal', sa.Float(), nullable=False),
+    sa.Column('discount_amount', sa.Float(), nullable=True),
+    sa.Column('tax_amount', sa.Float(), nullable=True),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.Column('payment_status', salespaymentstatus_enum, nullable=True),
+    sa.Column('sales_person', sa.String(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('order_number')
+    )
+    op.create_index(op.f('ix_sales_orders_id'), 'sales_orders', ['id'], unique=False)
+    op.create_table('transactions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('transaction_number', sa.String(), nullable=False),
+    sa.Column('type', transactiontype_enum, nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('date', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('reference', sa.String(), nullable=True),
+    sa.Column('payment_method', paymentmethod_enum, nullable=True),
+    sa.Column('tax_amount', sa.Float(), nullable=True),
+    sa.Column('approved', sa.Boolean(), nullable=True),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('transaction_number')
+    )
+    op.create_index(op.f('ix_transactions_id'), 'transactions', ['id'], unique=False)
+    op.create_table('waste_records',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('waste_number', sa.String(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('item_name', sa.String(), nullable=False),
+    sa.Column('item_type', sa.String(), nullable=False),
+    sa.Column('waste_quantity', sa.Float(), nullable=False),
+    sa.Column('waste_reason', wastereason_enum, nullable=False),
+    sa.Column('waste_value', sa.Float(), nullable=False),
+    sa.Column('date', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('reported_by', sa.String(), nullable=False),
+    sa.Column('approved', sa.Boolean(), nullable=True),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('disposal_method', sa.String(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('waste_number')
+    )
+    op.create_index(op.f('ix_waste_records_id'), 'waste_records', ['id'], unique=False)
+    op.create_table('activities',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('lead_id', sa.Integer(), nullable=True),
+    sa.Column('customer_id', sa.Integer(), nullable=True),
+    sa.Column('activity_type', sa.String(), nullable=False),
+    sa.Column('subject', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('date', sa.DateTime(), nullable=False),
+    sa.Column('duration', sa.Integer(), nullable=True),
+    sa.Column('outcome', sa.String(), nullable=True),
+    sa.Column('next_action', sa.String(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['employees.id'], ),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.ForeignKeyConstraint(['lead_id'], ['leads.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_activities_id'), 'activities', ['id'], unique=False)
+    op.create_table('invoices',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('invoice_number', sa.String(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=True),
+    sa.Column('sales_order_id', sa.Integer(), nullable=True),
+    sa.Column('issue_date', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('due_date', sa.DateTime(), nullable=False),
+    sa.Column('payment_terms', paymentterms_enum, nullable=True),
+    sa.Column('status', invoicestatus_enum, nullable=True),
+    sa.Column('items', sa.JSON(), nullable=False),
+    sa.Column('subtotal', sa.Float(), nullable=False),
+    sa.Column('discount_amount', sa.Float(), nullable=True),
+    sa.Column('tax_rate', sa.Float(), nullable=True),
+    sa.Column('tax_amount', sa.Float(), nullable=False),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.Column('paid_amount', sa.Float(), nullable=True),
+    sa.Column('balance_due', sa.Float(), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('terms_conditions', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.ForeignKeyConstraint(['sales_order_id'], ['sales_orders.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('invoice_number')
+    )
+    op.create_index(op.f('ix_invoices_id'), 'invoices', ['id'], unique=False)
+    op.create_table('opportunities',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=True),
+    sa.Column('lead_id', sa.Integer(), nullable=True),
+    sa.Column('value', sa.Float(), nullable=False),
+    sa.Column('probability', sa.Integer(), nullable=True),
+    sa.Column('stage', sa.String(), nullable=False),
+    sa.Column('expected_close_date', sa.DateTime(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('assigned_to', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['assigned_to'], ['employees.id'], ),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.ForeignKeyConstraint(['lead_id'], ['leads.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_opportunities_id'), 'opportunities', ['id'], unique=False)
+    op.create_table('productions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('production_number', sa.String(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=True),
+    sa.Column('batch_number', sa.String(), nullable=False),
+    sa.Column('planned_quantity', sa.Float(), nullable=False),
+    sa.Column('actual_quantity', sa.Float(), nullable=True),
+    sa.Column('start_date', sa.DateTime(), nullable=True),
+    sa.Column('end_date', sa.DateTime(), nullable=True),
+    sa.Column('status', productionstatus_enum, nullable=True),
+    sa.Column('raw_materials_used', sa.JSON(), nullable=True),
+    sa.Column('labor_cost', sa.Float(), nullable=True),
+    sa.Column('overhead_cost', sa.Float(), nullable=True),
+    sa.Column('total_cost', sa.Float(), nullable=True),
+    sa.Column('yield_percentage', sa.Float(), nullable=True),
+    sa.Column('quality_grade', sa.String(), nullable=True),
+    sa.Column('supervisor', sa.String(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['finished_products.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('production_number')
+    )
+    op.create_index(op.f('ix_productions_id'), 'productions', ['id'], unique=False)
+    op.create_table('quotations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('quotation_number', sa.String(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=True),
+    sa.Column('lead_id', sa.Integer(), nullable=True),
+    sa.Column('issue_date', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('valid_until', sa.DateTime(), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('items', sa.JSON(), nullable=False),
+    sa.Column('subtotal', sa.Float(), nullable=False),
+    sa.Column('discount_amount', sa.Float(), nullable=True),
+    sa.Column('tax_rate', sa.Float(), nullable=True),
+    sa.Column('tax_amount', sa.Float(), nullable=False),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('terms_conditions', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.ForeignKeyConstraint(['lead_id'], ['leads.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('quotation_number')
+    )
+    op.create_index(op.f('ix_quotations_id'), 'quotations', ['id'], unique=False)
+    op.create_table('payments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('payment_number', sa.String(), nullable=False),
+    sa.Column('invoice_id', sa.Integer(), nullable=True),
+    sa.Column('customer_id', sa.Integer(), nullable=True),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('payment_date', sa.DateTime(), nullable=False),
+    sa.Column('payment_method', sa.String(), nullable=False),
+    sa.Column('reference_number', sa.String(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.ForeignKeyConstraint(['invoice_id'], ['invoices.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('payment_number')
+    )
+    op.create_index(op.f('ix_payments_id'), 'payments', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_payments_id'), table_name='payments')
+    op.drop_table('payments')
+    op.drop_index(op.f('ix_quotations_id'), table_name='quotations')
+    op.drop_table('quotations')
+    op.drop_index(op.f('ix_productions_id'), table_name='productions')
+    op.drop_table('productions')
+    op.drop_index(op.f('ix_opportunities_id'), table_name='opportunities')
+    op.drop_table('opportunities')
+    op.drop_index(op.f('ix_invoices_id'), table_name='invoices')
+    op.drop_table('invoices')
+    op.drop_index(op.f('ix_activities_id'), table_name='activities')
+    op.drop_table('activities')
+    op.drop_index(op.f('ix_waste_records_id'), table_name='waste_records')
+    op.drop_table('waste_records')
+    op.drop_index(op.f('ix_transactions_id'), table_name='transactions')
+    op.drop_table('transactions')
+    op.drop_index(op.f('ix_sales_orders_id'), table_name='sales_orders')
+    op.drop_table('sales_orders')
+    op.drop_index(op.f('ix_raw_materials_name'), table_name='raw_materials')
+    op.drop_index(op.f('ix_raw_materials_id'), table_name='raw_materials')
+    op.drop_table('raw_materials')
+    op.drop_index(op.f('ix_quality_controls_id'), table_name='quality_controls')
+    op.drop_table('quality_controls')
+    op.drop_index(op.f('ix_purchase_orders_id'), table_name='purchase_orders')
+    op.drop_table('purchase_orders')
+    op.drop_index(op.f('ix_payrolls_id'), table_name='payrolls')
+    op.drop_table('payrolls')
+    op.drop_index(op.f('ix_leaves_id'), table_name='leaves')
+    op.drop_table('leaves')
+    op.drop_index(op.f('ix_leads_id'), table_name='leads')
+    op.drop_table('leads')
+    op.drop_index(op.f('ix_finished_products_name'), table_name='finished_products')
+    op.drop_index(op.f('ix_finished_products_id'), table_name='finished_products')
+    op.drop_table('finished_products')
+    op.drop_index(op.f('ix_attendances_id'), table_name='attendances')
+    op.drop_table('attendances')
+    op.drop_index(op.f('ix_alerts_id'), table_name='alerts')
+    op.drop_table('alerts')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_suppliers_name'), table_name='suppliers')
+    op.drop_index(op.f('ix_suppliers_id'), table_name='suppliers')
+    op.drop_table('suppliers')
+    op.drop_index(op.f('ix_employees_id'), table_name='employees')
+    op.drop_table('employees')
+    op.drop_index(op.f('ix_customers_name'), table_name='customers')
+    op.drop_index(op.f('ix_customers_id'), table_name='customers')
+    op.drop_table('customers')
+
+    bind = op.get_bind()
+    for enum in ENUMS:
+        enum.drop(bind, checkfirst=True)
@@ -0,0 +1,56 @@
+"""hot filter indexes
+
+Composite and partial indexes for the predicates used by factory analytics,
+reports, HRM and CRM. Built CONCURRENTLY so large tables stay writable.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 21:10:55.810362
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, partial index predicate)
+INDEXES = [
+    ('ix_productions_status_start_date', 'productions', ['status', 'start_date'], None),
+    ('ix_waste_records_date', 'waste_records', ['date'], None),
+    ('ix_waste_records_reason_date', 'waste_records', ['waste_reason', 'date'], None),
+    ('ix_sales_orders_order_date', 'sales_orders', ['order_date'], None),
+    ('ix_sales_orders_open_status', 'sales_orders', ['status'], "status IN ('PENDING', 'CONFIRMED')"),
+    ('ix_attendances_employee_id_date', 'attendances', ['employee_id', 'date'], None),
+    ('ix_attendances_date_status', 'attendances', ['date', 'status'], None),
+    ('ix_invoices_status_issue_date', 'invoices', ['status', 'issue_date'], None),
+    ('ix_activities_lead_id_date', 'activities', ['lead_id', 'date'], None),
+    ('ix_activities_date', 'activities', ['date'], None),
+    ('ix_leads_status', 'leads', ['status'], None),
+    ('ix_leaves_status_employee_id', 'leaves', ['status', 'employee_id'], None),
+    ('ix_payrolls_year_month', 'payrolls', ['year', 'month'], None),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
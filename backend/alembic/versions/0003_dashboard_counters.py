@@ -0,0 +1,63 @@
+"""dashboard counters
+
+Running totals for the analytics and CRM dashboards, maintained by the ORM
+flush hooks in app.db.counters. The table is filled from the current data
+here with a frozen copy of the counter queries; reconcile_counters keeps
+it honest afterwards.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 21:40:12.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('dashboard_counters',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('value', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    # Frozen copy of app.db.counters.COUNTERS as of this revision, so later
+    # changes to the app do not alter this migration. Enum columns store names.
+    counters = {
+        "raw_materials": "SELECT COUNT(*) FROM raw_materials",
+        "raw_materials_low_stock": "SELECT COUNT(*) FROM raw_materials WHERE status = 'LOW_STOCK'",
+        "finished_products": "SELECT COUNT(*) FROM finished_products",
+        "transactions_income": "SELECT COALESCE(SUM(amount), 0) FROM transactions WHERE type = 'INCOME'",
+        "transactions_expense": "SELECT COALESCE(SUM(amount), 0) FROM transactions WHERE type = 'EXPENSE'",
+        "productions_in_progress": "SELECT COUNT(*) FROM productions WHERE status = 'IN_PROGRESS'",
+        "productions_completed": "SELECT COUNT(*) FROM productions WHERE status = 'COMPLETED'",
+        "waste_value": "SELECT COALESCE(SUM(waste_value), 0) FROM waste_records",
+        "sales_total": "SELECT COALESCE(SUM(total_amount), 0) FROM sales_orders",
+        "sales_orders_open": "SELECT COUNT(*) FROM sales_orders WHERE status IN ('PENDING', 'CONFIRMED')",
+        "leads": "SELECT COUNT(*) FROM leads",
+        "leads_new": "SELECT COUNT(*) FROM leads WHERE status = 'NEW'",
+        "leads_qualified": "SELECT COUNT(*) FROM leads WHERE status = 'QUALIFIED'",
+        "opportunities": "SELECT COUNT(*) FROM opportunities",
+        "opportunities_value": "SELECT COALESCE(SUM(value), 0) FROM opportunities",
+        "invoices": "SELECT COUNT(*) FROM invoices",
+        "invoices_pending": "SELECT COUNT(*) FROM invoices WHERE status IN ('SENT', 'OVERDUE')",
+        "invoices_revenue": "SELECT COALESCE(SUM(total_amount), 0) FROM invoices WHERE status = 'PAID'",
+    }
+    op.execute(
+        "INSERT INTO dashboard_counters (name, value) VALUES "
+        + ", ".join(f"('{name}', ({query}))" for name, query in counters.items())
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('dashboard_counters')
@@ -0,0 +1,53 @@
+"""waste monthly rollup
+
+Waste totals per month, reason and item type for the waste analytics
+endpoints, maintained by the ORM flush hooks in app.db.waste_rollup and
+backfilled here from the existing waste records.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 21:52:37.904116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+wastereason_enum = postgresql.ENUM('EXPIRED', 'DAMAGED', 'CONTAMINATED', 'PRODUCTION_LOSS', 'SPILLAGE', 'OTHER', name='wastereason', create_type=False)
+
+
+def upgrade() -> None:
+    op.create_table('waste_monthly_rollup',
+    sa.Column('month', sa.DateTime(), nullable=False),
+    sa.Column('waste_reason', wastereason_enum, nullable=False),
+    sa.Column('item_type', sa.String(), nullable=False),
+    sa.Column('total_value', sa.Float(), nullable=False),
+    sa.Column('total_quantity', sa.Float(), nullable=False),
+    sa.Column('record_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('month', 'waste_reason', 'item_type')
+    )
+
+    # Frozen copy of app.db.waste_rollup.rebuild_waste_rollup as of this revision
+    op.execute("""
+        INSERT INTO waste_monthly_rollup
+            (month, waste_reason, item_type, total_value, total_quantity, record_count)
+        SELECT date_trunc('month', date), waste_reason, item_type,
+               SUM(waste_value), SUM(waste_quantity), COUNT(*)
+        FROM waste_records
+        WHERE date IS NOT NULL
+        GROUP BY 1, 2, 3
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('waste_monthly_rollup')
@@ -0,0 +1,35 @@
+"""analytics snapshots
+
+Latest precomputed results of the heavy analytics endpoints, written by the
+Celery worker (app.worker).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 22:06:41.552870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('analytics_snapshots',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.Column('duration_ms', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('analytics_snapshots')
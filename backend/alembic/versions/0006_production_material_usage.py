@@ -0,0 +1,70 @@
+"""production material usage
+
+Raw materials consumed per production, normalized out of
+productions.raw_materials_used for material consumption and turnover
+aggregates. Kept in step by the ORM flush hooks in app.db.material_usage
+and backfilled here from the existing JSON.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 22:31:08.417265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('production_material_usage',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('production_id', sa.Integer(), nullable=False),
+    sa.Column('material_id', sa.Integer(), nullable=False),
+    sa.Column('planned_quantity', sa.Float(), nullable=False),
+    sa.Column('actual_quantity', sa.Float(), nullable=False),
+    sa.Column('unit_cost', sa.Float(), nullable=False),
+    sa.Column('production_date', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['production_id'], ['productions.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['material_id'], ['raw_materials.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    # Frozen copy of app.db.material_usage.rebuild_material_usage as of this
+    # revision: malformed entries and unknown materials are skipped
+    numeric = "COALESCE(entry->>'{key}' ~ '^\\s*[-+]?([0-9]+\\.?[0-9]*|\\.[0-9]+)([eE][-+]?[0-9]+)?\\s*$', TRUE)"
+    op.execute(f"""
+        INSERT INTO production_material_usage
+            (production_id, material_id, planned_quantity, actual_quantity, unit_cost, production_date)
+        SELECT p.id, m.id,
+               COALESCE((entry->>'planned_quantity')::float, 0),
+               COALESCE((entry->>'actual_quantity')::float, 0),
+               COALESCE((entry->>'unit_cost')::float, 0),
+               p.start_date
+        FROM productions p
+        CROSS JOIN LATERAL json_array_elements(CASE json_typeof(p.raw_materials_used)
+            WHEN 'array' THEN p.raw_materials_used ELSE '[]'::json END) entry
+        JOIN raw_materials m ON m.id = CASE
+            WHEN json_typeof(entry) = 'object' AND entry->>'material_id' ~ '^[0-9]+$'
+            THEN (entry->>'material_id')::int END
+        WHERE {numeric.format(key='planned_quantity')}
+          AND {numeric.format(key='actual_quantity')}
+          AND {numeric.format(key='unit_cost')}
+    """)
+
+    # Built after the backfill, so the bulk insert does not maintain them row by row
+    op.create_index('ix_production_material_usage_material_date', 'production_material_usage', ['material_id', 'production_date'], unique=False)
+    op.create_index('ix_production_material_usage_production_id', 'production_material_usage', ['production_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_production_material_usage_production_id', table_name='production_material_usage')
+    op.drop_index('ix_production_material_usage_material_date', table_name='production_material_usage')
+    op.drop_table('production_material_usage')
@@ -1,27 +1,50 @@
-from typing import Generator
+import asyncio
+from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.revocation import is_token_revoked
 from app.core.security import verify_token
-from app.db.database import get_db
+from app.db.database import get_db, get_async_db, get_read_db, get_async_read_db
 from app.models.user import User
-from app.crud.user import get_user_by_username
+from app.crud.user import get_async_principal, get_principal
 
 security = HTTPBearer()
 
-def get_current_user(
-    db: Session = Depends(get_db),
+def _check_payload(payload: dict, revoked: bool) -> dict:
+    # Refresh tokens are only accepted by /auth/refresh
+    if payload.get("type") == "refresh" or revoked:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
+    return payload
+
+def get_token_payload(
     credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> User:
-    token = credentials.credentials
-    payload = verify_token(token)
+) -> dict:
+    payload = verify_token(credentials.credentials)
+    return _check_payload(payload, is_token_revoked(payload))
+
+async def get_async_token_payload(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> dict:
+    """get_token_payload without a threadpool dependency; only the revocation
+    lookup, which may go to Redis, runs in a thread"""
+    payload = verify_token(credentials.credentials)
+    return _check_payload(payload, await asyncio.to_thread(is_token_revoked, payload))
+
+def _subject(payload: dict) -> str:
     username: str = payload.get("sub")
     if username is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
-    user = get_user_by_username(db, username=username)
+    return username
+
+def _check_principal(user: Optional[User]) -> User:
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -34,6 +57,20 @@ def get_current_user(
         )
     return user
 
+def get_current_user(
+    db: Session = Depends(get_db),
+    payload: dict = Depends(get_token_payload)
+) -> User:
+    return _check_principal(get_principal(db, username=_subject(payload)))
+
+async def get_async_current_user(
+    db: AsyncSession = Depends(get_async_db),
+    payload: dict = Depends(get_async_token_payload)
+) -> User:
+    """get_current_user for async endpoints: authenticates on the event loop
+    through an AsyncSession instead of a threadpool thread and a sync Session"""
+    return _check_principal(await get_async_principal(db, username=_subject(payload)))
+
 def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -41,12 +78,20 @@ def get_current_active_user(
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
-def get_current_admin_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+def _check_admin(current_user: User) -> User:
     if current_user.role not in ["admin", "manager"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+def get_current_admin_user(
+    current_user: User = Depends(get_current_user),
+) -> User:
+    return _check_admin(current_user)
+
+async def get_async_current_admin_user(
+    current_user: User = Depends(get_async_current_user),
+) -> User:
+    return _check_admin(current_user)
\ No newline at end of file
@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.api.deps import get_db, get_current_admin_user
+from app.core.config import settings
+from app.core.precompute import registry, request_refresh
+from app.db.database import get_pool_status
+from app.db.instrumentation import slow_query_log
+from app.models.analytics import AnalyticsSnapshot
+from app.models.user import User
+
+router = APIRouter()
+
+@router.get("/db-pool")
+def get_db_pool_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Live connection pool statistics for sizing the pool against real traffic"""
+    return get_pool_status()
+
+@router.get("/slow-queries")
+def get_slow_queries(
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Most recent slow statements with route, parameters and EXPLAIN plan"""
+    return {
+        "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+        "log_file": settings.SLOW_QUERY_LOG_FILE,
+        "queries": slow_query_log.recent(limit),
+    }
+
+@router.get("/precompute")
+def get_precomputed_snapshots(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """When each precomputed analytics snapshot was last refreshed"""
+    snapshots = {snapshot.name: snapshot for snapshot in db.query(AnalyticsSnapshot).all()}
+    return {
+        "interval_seconds": settings.PRECOMPUTE_INTERVAL_SECONDS,
+        "max_age_seconds": settings.PRECOMPUTE_MAX_AGE_SECONDS,
+        "snapshots": [
+            {
+                "name": name,
+                "computed_at": snapshots[name].computed_at if name in snapshots else None,
+                "compute_ms": snapshots[name].duration_ms if name in snapshots else None,
+            }
+            for name in sorted(registry)
+        ],
+    }
+
+@router.post("/precompute/{name}")
+def refresh_precomputed_snapshot(
+    name: str,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Queue an immediate refresh of one precomputed snapshot"""
+    if name not in registry:
+        raise HTTPException(status_code=404, detail="Unknown snapshot")
+    if not request_refresh(name, force=True):
+        raise HTTPException(status_code=503, detail="Task queue unavailable")
+    return {"name": name, "queued": True}
@@ -1,93 +1,98 @@
+import asyncio
+from datetime import date, timedelta
+from typing import Literal, Optional
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.api.deps import get_db, get_current_user
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, literal_column, select
+from app.api.deps import get_async_read_db, get_async_current_user
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.response_cache import cached_response
+from app.db.counters import read_counters
 from app.models.user import User
-from app.models.inventory import RawMaterial, FinishedProduct
-from app.models.production import Production
-from app.models.waste import WasteRecord
-from app.models.finance import Transaction
-from app.models.sales import SalesOrder
+from app.models.inventory import FinishedProduct
+from app.models.production import Production, ProductionStatus
+from app.models.waste import WasteMonthlyRollup, WasteRecord
 
 router = APIRouter()
 
-@router.get("/dashboard")
-def get_dashboard_analytics(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    # Inventory metrics
-    total_raw_materials = db.query(func.count(RawMaterial.id)).scalar()
-    total_finished_products = db.query(func.count(FinishedProduct.id)).scalar()
-    low_stock_items = db.query(func.count(RawMaterial.id)).filter(
-        RawMaterial.status == "low-stock"
-    ).scalar()
-    
-    # Financial metrics
-    total_income = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.type == "income"
-    ).scalar() or 0
-    total_expenses = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.type == "expense"
-    ).scalar() or 0
-    
-    # Production metrics
-    active_productions = db.query(func.count(Production.id)).filter(
-        Production.status == "in-progress"
-    ).scalar()
-    completed_productions = db.query(func.count(Production.id)).filter(
-        Production.status == "completed"
-    ).scalar()
-    
-    # Waste metrics
-    total_waste_value = db.query(func.sum(WasteRecord.waste_value)).scalar() or 0
-    
-    # Sales metrics
-    total_sales = db.query(func.sum(SalesOrder.total_amount)).scalar() or 0
-    pending_orders = db.query(func.count(SalesOrder.id)).filter(
-        SalesOrder.status.in_(["pending", "confirmed"])
-    ).scalar()
+# Dashboard results shared by concurrent requests for a few seconds, so a
+# burst of users opening the dashboard triggers a single computation
+dashboard_snapshot = TTLCache(max_size=1, ttl=settings.DASHBOARD_SNAPSHOT_TTL_SECONDS)
+_dashboard_lock = asyncio.Lock()
+
+DASHBOARD_COUNTERS = [
+    "raw_materials", "raw_materials_low_stock", "finished_products",
+    "transactions_income", "transactions_expense",
+    "productions_in_progress", "productions_completed",
+    "waste_value", "sales_total", "sales_orders_open",
+]
+
+async def compute_dashboard(db: AsyncSession) -> dict:
+    # Totals are maintained incrementally (app.db.counters), so this is an O(1) read
+    counters = await read_counters(db, DASHBOARD_COUNTERS)
     
     return {
         "inventory": {
-            "total_raw_materials": total_raw_materials,
-            "total_finished_products": total_finished_products,
-            "low_stock_items": low_stock_items,
+            "total_raw_materials": counters["raw_materials"],
+            "total_finished_products": counters["finished_products"],
+            "low_stock_items": counters["raw_materials_low_stock"],
         },
         "financial": {
-            "total_income": total_income,
-            "total_expenses": total_expenses,
-            "net_profit": total_income - total_expenses,
+            "total_income": counters["transactions_income"],
+            "total_expenses": counters["transactions_expense"],
+            "net_profit": counters["transactions_income"] - counters["transactions_expense"],
         },
         "production": {
-            "active_productions": active_productions,
-            "completed_productions": completed_productions,
+            "active_productions": counters["productions_in_progress"],
+            "completed_productions": counters["productions_completed"],
         },
         "waste": {
-            "total_waste_value": total_waste_value,
+            "total_waste_value": counters["waste_value"],
         },
         "sales": {
-            "total_sales": total_sales,
-            "pending_orders": pending_orders,
+            "total_sales": counters["sales_total"],
+            "pending_orders": counters["sales_orders_open"],
         }
     }
 
+@router.get("/dashboard")
+async def get_dashboard_analytics(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_async_current_user)
+):
+    if settings.DASHBOARD_SNAPSHOT_TTL_SECONDS <= 0:
+        return await compute_dashboard(db)
+    
+    dashboard = dashboard_snapshot.get("dashboard")
+    if dashboard is None:
+        async with _dashboard_lock:
+            # Requests that waited on the lock reuse the snapshot computed before them
+            dashboard = dashboard_snapshot.get("dashboard")
+            if dashboard is None:
+                dashboard = await compute_dashboard(db)
+                dashboard_snapshot.set("dashboard", dashboard)
+    return dashboard
+
 @router.get("/waste-analytics")
-def get_waste_analytics(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+@cached_response(WasteRecord)
+async def get_waste_analytics(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_async_current_user)
 ):
-    # Waste by reason
-    waste_by_reason = db.query(
-        WasteRecord.waste_reason,
-        func.sum(WasteRecord.waste_value).label("total_value")
-    ).group_by(WasteRecord.waste_reason).all()
+    # Read from the monthly rollup (app.db.waste_rollup) instead of scanning waste_records;
+    # groups without records are left out, as a GROUP BY over the records would
+    has_records = func.sum(WasteMonthlyRollup.record_count) > 0
+    waste_by_reason = (await db.execute(select(
+        WasteMonthlyRollup.waste_reason,
+        func.sum(WasteMonthlyRollup.total_value).label("total_value")
+    ).group_by(WasteMonthlyRollup.waste_reason).having(has_records))).all()
     
     # Monthly waste trend
-    monthly_waste = db.query(
-        func.date_trunc('month', WasteRecord.date).label('month'),
-        func.sum(WasteRecord.waste_value).label('total_value')
-    ).group_by(func.date_trunc('month', WasteRecord.date)).all()
+    monthly_waste = (await db.execute(select(
+        WasteMonthlyRollup.month,
+        func.sum(WasteMonthlyRollup.total_value).label('total_value')
+    ).group_by(WasteMonthlyRollup.month).having(has_records).order_by(WasteMonthlyRollup.month))).all()
     
     return {
         "waste_by_reason": [
@@ -100,27 +105,94 @@ def get_waste_analytics(
         ]
     }
 
+def _efficiency(planned, actual) -> float:
+    return (actual / planned * 100) if planned else 0
+
+def _efficiency_metrics():
+    """Aggregate columns shared by the totals, groups and series queries"""
+    return (
+        func.coalesce(func.sum(Production.planned_quantity), 0).label("planned"),
+        func.coalesce(func.sum(Production.actual_quantity), 0).label("actual"),
+        func.coalesce(func.avg(Production.yield_percentage), 0).label("average_yield"),
+        func.count(Production.id).label("productions"),
+    )
+
+def _efficiency_row(row) -> dict:
+    return {
+        "efficiency": _efficiency(row.planned, row.actual),
+        "average_yield": row.average_yield,
+        "total_productions": row.productions,
+        "planned_quantity": row.planned,
+        "actual_quantity": row.actual,
+    }
+
 @router.get("/production-efficiency")
-def get_production_efficiency(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+@cached_response(Production, FinishedProduct)
+async def get_production_efficiency(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    product_id: Optional[int] = None,
+    group_by: Optional[Literal["product", "supervisor"]] = None,
+    bucket: Optional[Literal["day", "week", "month"]] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_async_current_user)
 ):
-    # Overall efficiency
-    productions = db.query(Production).filter(
-        Production.status == "completed"
-    ).all()
+    """Efficiency of completed productions, aggregated in SQL
+
+    Optionally limited to productions started in [start_date, end_date] or to
+    one product, broken down by product or supervisor, and as a series of
+    day/week/month buckets of the start date.
+    """
+    filters = [Production.status == ProductionStatus.COMPLETED]
+    if start_date:
+        filters.append(Production.start_date >= start_date)
+    if end_date:
+        filters.append(Production.start_date < end_date + timedelta(days=1))
+    if product_id is not None:
+        filters.append(Production.product_id == product_id)
     
-    if not productions:
+    # Overall efficiency
+    totals = (await db.execute(select(*_efficiency_metrics()).where(*filters))).one()
+    if not totals.productions:
         return {"efficiency": 0, "average_yield": 0}
     
-    total_planned = sum(p.planned_quantity for p in productions)
-    total_actual = sum(p.actual_quantity for p in productions)
-    average_yield = sum(p.yield_percentage for p in productions) / len(productions)
+    result = {
+        "efficiency": _efficiency(totals.planned, totals.actual),
+        "average_yield": totals.average_yield,
+        "total_productions": totals.productions,
+    }
+    
+    if group_by == "product":
+        rows = (await db.execute(
+            select(Production.product_id, FinishedProduct.name, *_efficiency_metrics())
+            .outerjoin(FinishedProduct, FinishedProduct.id == Production.product_id)
+            .where(*filters)
+            .group_by(Production.product_id, FinishedProduct.name)
+            .order_by(Production.product_id)
+        )).all()
+        result["groups"] = [
+            {"product_id": row.product_id, "product_name": row.name, **_efficiency_row(row)}
+            for row in rows
+        ]
+    elif group_by == "supervisor":
+        rows = (await db.execute(
+            select(Production.supervisor, *_efficiency_metrics())
+            .where(*filters)
+            .group_by(Production.supervisor)
+            .order_by(Production.supervisor)
+        )).all()
+        result["groups"] = [{"supervisor": row.supervisor, **_efficiency_row(row)} for row in rows]
     
-    efficiency = (total_actual / total_planned * 100) if total_planned > 0 else 0
+    if bucket:
+        # Literal unit (validated above) so SELECT and GROUP BY render the same
+        # expression under server-side parameter binding (asyncpg)
+        period = func.date_trunc(literal_column(f"'{bucket}'"), Production.start_date)
+        rows = (await db.execute(
+            select(period.label("period"), *_efficiency_metrics())
+            .where(*filters, Production.start_date.is_not(None))
+            .group_by(period)
+            .order_by(period)
+        )).all()
+        result["series"] = [{"period": row.period.isoformat(), **_efficiency_row(row)} for row in rows]
     
-    return {
-        "efficiency": efficiency,
-        "average_yield": average_yield,
-        "total_productions": len(productions)
-    }
\ No newline at end of file
+    return result
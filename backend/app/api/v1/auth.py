@@ -1,21 +1,24 @@
 from datetime import timedelta
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_async_db, get_current_user, get_token_payload
 from app.core.config import settings
-from app.core.security import create_access_token, create_refresh_token
-from app.crud.user import authenticate_user
+from app.core.revocation import revoke_token
+from app.core.security import create_access_token, create_refresh_token, verify_token
+from app.crud.user import authenticate_user, get_principal
 from app.schemas.user import Token, User
 
 router = APIRouter()
 
 @router.post("/login", response_model=Token)
-def login_for_access_token(
-    db: Session = Depends(get_db),
+async def login_for_access_token(
+    db: AsyncSession = Depends(get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ):
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -39,14 +42,43 @@ def refresh_token(
     refresh_token: str,
     db: Session = Depends(get_db)
 ):
-    # Implement refresh token logic
-    pass
+    """Exchange a refresh token for a new token pair; each refresh token works once"""
+    payload = verify_token(refresh_token)
+    username = payload.get("sub")
+    # Revoking first (atomically) means a replayed or concurrently reused token is refused
+    if payload.get("type") != "refresh" or username is None or not revoke_token(payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user = get_principal(db, username=username)
+    if user is None or not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return {
+        "access_token": create_access_token(subject=user.username),
+        "refresh_token": create_refresh_token(subject=user.username),
+        "token_type": "bearer",
+    }
 
 @router.get("/me", response_model=User)
 def read_users_me(current_user: User = Depends(get_current_user)):
     return current_user
 
 @router.post("/logout")
-def logout(current_user: User = Depends(get_current_user)):
-    # Implement logout logic (blacklist token)
+def logout(
+    refresh_token: Optional[str] = None,
+    payload: dict = Depends(get_token_payload),
+    current_user: User = Depends(get_current_user)
+):
+    revoke_token(payload)
+    if refresh_token:
+        refresh_payload = verify_token(refresh_token)
+        if refresh_payload.get("type") == "refresh" and refresh_payload.get("sub") == payload.get("sub"):
+            revoke_token(refresh_payload)
     return {"message": "Successfully logged out"}
\ No newline at end of file
@@ -1,8 +1,10 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.api.deps import get_db, get_current_user
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.api.deps import get_db, get_async_db, get_current_user, get_async_current_user
+from app.db.counters import read_counters
 from app.models.user import User
 from app.models.crm import Lead, Activity, Opportunity, LeadStatus, LeadSource
 from app.models.invoice import Invoice, Payment, Quotation
@@ -11,22 +13,22 @@ from datetime import datetime, timedelta
 router = APIRouter()
 
 @router.get("/leads")
-def get_leads(
+async def get_leads(
     skip: int = 0,
     limit: int = 100,
     status: str = None,
     assigned_to: int = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_async_current_user)
 ):
-    query = db.query(Lead)
+    query = select(Lead)
     
     if status:
         query = query.filter(Lead.status == status)
     if assigned_to:
         query = query.filter(Lead.assigned_to == assigned_to)
     
-    leads = query.offset(skip).limit(limit).all()
+    leads = (await db.scalars(query.offset(skip).limit(limit))).all()
     return leads
 
 @router.post("/leads")
@@ -60,14 +62,14 @@ def update_lead(
     return lead
 
 @router.get("/activities")
-def get_activities(
+async def get_activities(
     lead_id: int = None,
     customer_id: int = None,
     activity_type: str = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_async_current_user)
 ):
-    query = db.query(Activity)
+    query = select(Activity)
     
     if lead_id:
         query = query.filter(Activity.lead_id == lead_id)
@@ -76,7 +78,7 @@ def get_activities(
     if activity_type:
         query = query.filter(Activity.activity_type == activity_type)
     
-    activities = query.order_by(Activity.date.desc()).all()
+    activities = (await db.scalars(query.order_by(Activity.date.desc()))).all()
     return activities
 
 @router.post("/activities")
@@ -93,22 +95,22 @@ def create_activity(
     return activity
 
 @router.get("/opportunities")
-def get_opportunities(
+async def get_opportunities(
     skip: int = 0,
     limit: int = 100,
     stage: str = None,
     assigned_to: int = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_async_current_user)
 ):
-    query = db.query(Opportunity)
+    query = select(Opportunity)
     
     if stage:
         query = query.filter(Opportunity.stage == stage)
     if assigned_to:
         query = query.filter(Opportunity.assigned_to == assigned_to)
     
-    opportunities = query.offset(skip).limit(limit).all()
+    opportunities = (await db.scalars(query.offset(skip).limit(limit))).all()
     return opportunities
 
 @router.post("/opportunities")
@@ -124,22 +126,22 @@ def create_opportunity(
     return opportunity
 
 @router.get("/invoices")
-def get_invoices(
+async def get_invoices(
     skip: int = 0,
     limit: int = 100,
     status: str = None,
     customer_id: int = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_async_current_user)
 ):
-    query = db.query(Invoice)
+    query = select(Invoice)
     
     if status:
         query = query.filter(Invoice.status == status)
     if customer_id:
         query = query.filter(Invoice.customer_id == customer_id)
     
-    invoices = query.offset(skip).limit(limit).all()
+    invoices = (await db.scalars(query.offset(skip).limit(limit))).all()
     return invoices
 
 @router.post("/invoices")
@@ -193,22 +195,22 @@ def create_payment(
     return payment
 
 @router.get("/quotations")
-def get_quotations(
+async def get_quotations(
     skip: int = 0,
     limit: int = 100,
     status: str = None,
     customer_id: int = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_async_current_user)
 ):
-    query = db.query(Quotation)
+    query = select(Quotation)
     
     if status:
         query = query.filter(Quotation.status == status)
     if customer_id:
         query = query.filter(Quotation.customer_id == customer_id)
     
-    quotations = query.offset(skip).limit(limit).all()
+    quotations = (await db.scalars(query.offset(skip).limit(limit))).all()
     return quotations
 
 @router.post("/quotations")
@@ -232,26 +234,30 @@ def create_quotation(
     return quotation
 
 @router.get("/dashboard")
-def get_crm_dashboard(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_crm_dashboard(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_async_current_user)
 ):
-    # Lead metrics
-    total_leads = db.query(Lead).count()
-    new_leads = db.query(Lead).filter(Lead.status == LeadStatus.NEW).count()
-    qualified_leads = db.query(Lead).filter(Lead.status == LeadStatus.QUALIFIED).count()
+    # Totals are maintained incrementally (app.db.counters), so this is an O(1) read
+    counters = await read_counters(db, [
+        "leads", "leads_new", "leads_qualified", "opportunities", "opportunities_value",
+        "invoices", "invoices_pending", "invoices_revenue",
+    ])
+    total_leads = counters["leads"]
+    new_leads = counters["leads_new"]
+    qualified_leads = counters["leads_qualified"]
     
     # Opportunity metrics
-    total_opportunities = db.query(Opportunity).count()
-    total_opportunity_value = db.query(func.sum(Opportunity.value)).scalar() or 0
+    total_opportunities = counters["opportunities"]
+    total_opportunity_value = counters["opportunities_value"]
     
     # Invoice metrics
-    total_invoices = db.query(Invoice).count()
-    pending_invoices = db.query(Invoice).filter(Invoice.status.in_(["sent", "overdue"])).count()
-    total_revenue = db.query(func.sum(Invoice.total_amount)).filter(Invoice.status == "paid").scalar() or 0
+    total_invoices = counters["invoices"]
+    pending_invoices = counters["invoices_pending"]
+    total_revenue = counters["invoices_revenue"]
     
     # Recent activities
-    recent_activities = db.query(Activity).order_by(Activity.date.desc()).limit(10).all()
+    recent_activities = (await db.scalars(select(Activity).order_by(Activity.date.desc()).limit(10))).all()
     
     return {
         "leads": {
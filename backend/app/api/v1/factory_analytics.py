@@ -1,60 +1,135 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
-from app.api.deps import get_db, get_current_user
+from sqlalchemy import func, extract, literal_column
+from app.api.deps import get_read_db, get_current_user
+from app.core.precompute import precomputed, serve_snapshot
+from app.core.response_cache import cached_response
 from app.models.user import User
-from app.models.production import Production
+from app.models.production import Production, ProductionMaterialUsage, ProductionStatus
 from app.models.inventory import RawMaterial, FinishedProduct
-from app.models.waste import WasteRecord
+from app.models.waste import WasteRecord, WasteReason
 from app.models.finance import Transaction
-from datetime import datetime, date, timedelta
-from typing import Optional
+from datetime import date, timedelta
+from types import SimpleNamespace
+from typing import Literal, Optional
 
 router = APIRouter()
 
+def _cost_metrics():
+    """Production cost aggregates shared by the totals and the breakdowns"""
+    return (
+        func.coalesce(func.sum(Production.total_cost), 0).label("total_cost"),
+        func.coalesce(func.sum(Production.labor_cost), 0).label("labor_cost"),
+        func.coalesce(func.sum(Production.overhead_cost), 0).label("overhead_cost"),
+        func.coalesce(func.sum(Production.actual_quantity), 0).label("units_produced"),
+        func.coalesce(func.sum(Production.planned_quantity), 0).label("planned_quantity"),
+        func.count(Production.id).label("productions"),
+    )
+
+def _cost_row(row, waste_cost: Optional[float]) -> dict:
+    return {
+        "production_cost": row.total_cost,
+        "material_cost": row.total_cost - row.labor_cost - row.overhead_cost,
+        "labor_cost": row.labor_cost,
+        "overhead_cost": row.overhead_cost,
+        "waste_cost": waste_cost,
+        "units_produced": row.units_produced,
+        "cost_per_unit": row.total_cost / row.units_produced if row.units_produced > 0 else 0,
+        "productions_count": row.productions,
+    }
+
+def _cost_breakdown(db: Session, group_by: str, production_filters: list, waste_filters: list) -> list:
+    """Cost per product, supervisor or period, with the waste attributable to it"""
+    if group_by == "product":
+        rows = db.query(Production.product_id, FinishedProduct.name, *_cost_metrics()).outerjoin(
+            FinishedProduct, FinishedProduct.id == Production.product_id
+        ).filter(*production_filters).group_by(
+            Production.product_id, FinishedProduct.name
+        ).order_by(Production.product_id).all()
+        # Only finished-product waste can be attributed to a product
+        waste = dict(db.query(WasteRecord.item_id, func.sum(WasteRecord.waste_value)).filter(
+            *waste_filters, WasteRecord.item_type == "finished-product"
+        ).group_by(WasteRecord.item_id).all())
+        return [
+            {"product_id": row.product_id, "product_name": row.name,
+             **_cost_row(row, waste.get(row.product_id, 0))}
+            for row in rows
+        ]
+    
+    if group_by == "supervisor":
+        rows = db.query(Production.supervisor, *_cost_metrics()).filter(
+            *production_filters
+        ).group_by(Production.supervisor).order_by(Production.supervisor).all()
+        return [{"supervisor": row.supervisor, **_cost_row(row, None)} for row in rows]
+    
+    # Literal unit (validated by the endpoint) so SELECT and GROUP BY render
+    # the same expression under server-side parameter binding
+    unit = literal_column(f"'{group_by}'")
+    period = func.date_trunc(unit, Production.start_date)
+    rows = db.query(period.label("period"), *_cost_metrics()).filter(
+        *production_filters, Production.start_date.is_not(None)
+    ).group_by(period).all()
+    waste_period = func.date_trunc(unit, WasteRecord.date)
+    waste = dict(db.query(waste_period, func.sum(WasteRecord.waste_value)).filter(
+        *waste_filters
+    ).group_by(waste_period).all())
+    
+    costs = {row.period: row for row in rows}
+    empty = SimpleNamespace(**{column.name: 0 for column in _cost_metrics()})
+    return [
+        {"period": period.isoformat(), **_cost_row(costs.get(period, empty), waste.get(period, 0))}
+        for period in sorted(set(costs) | set(waste))
+    ]
+
 @router.get("/cost-analysis")
+@cached_response(Production, WasteRecord, FinishedProduct)
 def get_cost_analysis(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    db: Session = Depends(get_db),
+    group_by: Optional[Literal["product", "month", "week", "supervisor"]] = None,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Advanced cost analysis for factory operations"""
+    """Advanced cost analysis for factory operations
+    
+    Totals and breakdowns are aggregated in SQL; group_by adds a per-product,
+    per-supervisor or monthly/weekly cost series under "breakdown".
+    """
     
     if not start_date:
         start_date = date.today() - timedelta(days=30)
     if not end_date:
         end_date = date.today()
     
-    # Production costs
-    productions = db.query(Production).filter(
+    production_filters = [
         Production.start_date >= start_date,
         Production.end_date <= end_date,
-        Production.status == "completed"
-    ).all()
+        Production.status == ProductionStatus.COMPLETED
+    ]
+    waste_filters = [
+        WasteRecord.date >= start_date,
+        WasteRecord.date <= end_date
+    ]
     
-    total_production_cost = sum(p.total_cost for p in productions)
-    total_labor_cost = sum(p.labor_cost for p in productions)
-    total_overhead_cost = sum(p.overhead_cost for p in productions)
+    # Production costs
+    totals = db.query(*_cost_metrics()).filter(*production_filters).one()
+    total_production_cost = totals.total_cost
+    total_labor_cost = totals.labor_cost
+    total_overhead_cost = totals.overhead_cost
     total_material_cost = total_production_cost - total_labor_cost - total_overhead_cost
     
     # Waste costs
-    waste_records = db.query(WasteRecord).filter(
-        WasteRecord.date >= start_date,
-        WasteRecord.date <= end_date
-    ).all()
-    
-    total_waste_cost = sum(w.waste_value for w in waste_records)
-    waste_by_reason = {}
-    for waste in waste_records:
-        waste_by_reason[waste.waste_reason] = waste_by_reason.get(waste.waste_reason, 0) + waste.waste_value
+    waste_by_reason = dict(db.query(WasteRecord.waste_reason, func.sum(WasteRecord.waste_value)).filter(
+        *waste_filters
+    ).group_by(WasteRecord.waste_reason).all())
+    total_waste_cost = sum(waste_by_reason.values())
     
     # Cost per unit analysis
-    total_units_produced = sum(p.actual_quantity for p in productions)
+    total_units_produced = totals.units_produced
     cost_per_unit = total_production_cost / total_units_produced if total_units_produced > 0 else 0
     
     # Efficiency metrics
-    planned_vs_actual = sum(p.planned_quantity for p in productions)
+    planned_vs_actual = totals.planned_quantity
     efficiency_ratio = (total_units_produced / planned_vs_actual * 100) if planned_vs_actual > 0 else 0
     
     # Cost breakdown percentages
@@ -65,7 +140,7 @@ def get_cost_analysis(
         "waste_cost": (total_waste_cost / total_production_cost * 100) if total_production_cost > 0 else 0
     }
     
-    return {
+    result = {
         "period": f"{start_date} to {end_date}",
         "total_production_cost": total_production_cost,
         "total_material_cost": total_material_cost,
@@ -77,138 +152,200 @@ def get_cost_analysis(
         "cost_breakdown": cost_breakdown,
         "waste_by_reason": waste_by_reason,
         "units_produced": total_units_produced,
-        "productions_count": len(productions)
+        "productions_count": totals.productions
     }
+    if group_by:
+        result["group_by"] = group_by
+        result["breakdown"] = _cost_breakdown(db, group_by, production_filters, waste_filters)
+    return result
+
+def _waste_frame(db: Session, since: date):
+    """Waste since `since` pre-aggregated in SQL to one row per item, reason
+    and month, as a DataFrame"""
+    # pandas is imported on first use to keep it out of worker startup
+    import pandas as pd
+    
+    # Literal unit so SELECT and GROUP BY render the same expression
+    month = func.date_trunc(literal_column("'month'"), WasteRecord.date)
+    rows = db.query(
+        WasteRecord.item_name,
+        WasteRecord.waste_reason,
+        month.label("month"),
+        func.sum(WasteRecord.waste_value),
+        func.sum(WasteRecord.waste_quantity),
+        func.count(WasteRecord.id),
+    ).filter(
+        WasteRecord.date >= since
+    ).group_by(WasteRecord.item_name, WasteRecord.waste_reason, month).all()
+    
+    frame = pd.DataFrame.from_records(
+        rows, columns=["item", "reason", "month", "value", "quantity", "occurrences"]
+    )
+    # Zero rows give object columns, which nlargest and friends refuse
+    frame = frame.astype({"value": float, "quantity": float, "occurrences": int})
+    frame["reason"] = frame["reason"].map(lambda reason: getattr(reason, "value", reason))
+    frame["month"] = pd.to_datetime(frame["month"]).dt.strftime("%Y-%m")
+    return frame
 
 @router.get("/waste-optimization")
+@cached_response(WasteRecord)
 def get_waste_optimization(
-    db: Session = Depends(get_db),
+    days: int = Query(90, ge=1, le=5 * 366),
+    top_n: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Waste optimization recommendations"""
-    
-    # Get waste data for last 3 months
-    three_months_ago = date.today() - timedelta(days=90)
-    waste_records = db.query(WasteRecord).filter(
-        WasteRecord.date >= three_months_ago
-    ).all()
-    
-    # Analyze waste patterns
-    waste_by_item = {}
-    waste_by_reason = {}
-    waste_trends = {}
-    
-    for waste in waste_records:
-        # By item
-        if waste.item_name not in waste_by_item:
-            waste_by_item[waste.item_name] = {
-                "total_value": 0,
-                "total_quantity": 0,
-                "occurrences": 0,
-                "main_reason": waste.waste_reason
-            }
-        waste_by_item[waste.item_name]["total_value"] += waste.waste_value
-        waste_by_item[waste.item_name]["total_quantity"] += waste.waste_quantity
-        waste_by_item[waste.item_name]["occurrences"] += 1
-        
-        # By reason
-        waste_by_reason[waste.waste_reason] = waste_by_reason.get(waste.waste_reason, 0) + waste.waste_value
-        
-        # Monthly trends
-        month_key = waste.date[:7]  # YYYY-MM
-        waste_trends[month_key] = waste_trends.get(month_key, 0) + waste.waste_value
+    """Waste optimization recommendations
+    
+    Waste over the last `days` is grouped by item, reason and month in SQL
+    and analysed column-wise: per-item, per-reason and per-month totals,
+    top-N rankings and an item x month value matrix for the top items.
+    """
+    frame = _waste_frame(db, date.today() - timedelta(days=days))
+    months_covered = days / 30
+    # Thresholds below were set for a 90-day window
+    window_scale = days / 90
+    
+    by_item = frame.groupby("item").agg(
+        total_value=("value", "sum"), total_quantity=("quantity", "sum"), occurrences=("occurrences", "sum")
+    ).sort_values("total_value", ascending=False)
+    # Dominant reason per item: the reason with the highest waste value
+    item_reason = frame.groupby(["item", "reason"])["value"].sum()
+    if not item_reason.empty:
+        by_item["main_reason"] = item_reason.groupby(level="item").idxmax().str[1]
+    else:
+        by_item["main_reason"] = None
+    
+    waste_by_reason = frame.groupby("reason")["value"].sum().to_dict()
+    waste_trends = frame.groupby("month")["value"].sum().sort_index().to_dict()
+    
+    top_items = by_item.head(top_n)
+    matrix_months = sorted(waste_trends)
+    matrix_items = {}
+    if not top_items.empty:
+        matrix = frame[frame["item"].isin(top_items.index)].pivot_table(
+            index="item", columns="month", values="value", aggfunc="sum", fill_value=0
+        ).reindex(index=top_items.index, columns=matrix_months, fill_value=0)
+        matrix_items = {item: values.tolist() for item, values in matrix.iterrows()}
     
     # Generate recommendations
     recommendations = []
     
     # High waste items
-    sorted_waste_items = sorted(waste_by_item.items(), key=lambda x: x[1]["total_value"], reverse=True)
-    for item_name, data in sorted_waste_items[:5]:
-        if data["total_value"] > 10000:  # PKR 10,000 threshold
-            recommendations.append({
-                "type": "high_waste_item",
-                "priority": "high",
-                "item": item_name,
-                "issue": f"High waste value: PKR {data['total_value']:,.2f}",
-                "recommendation": f"Review {data['main_reason']} processes for {item_name}",
-                "potential_savings": data["total_value"] * 0.3  # 30% reduction potential
-            })
+    top_five = by_item.head(5)
+    high_waste_items = top_five[top_five["total_value"] > 10000 * window_scale]  # PKR 10,000 per 90 days
+    for item_name, data in high_waste_items.iterrows():
+        recommendations.append({
+            "type": "high_waste_item",
+            "priority": "high",
+            "item": item_name,
+            "issue": f"High waste value: PKR {data['total_value']:,.2f}",
+            "recommendation": f"Review {data['main_reason']} processes for {item_name}",
+            "potential_savings": data["total_value"] * 0.3  # 30% reduction potential
+        })
     
     # Waste reason analysis
-    if "expired" in waste_by_reason and waste_by_reason["expired"] > 20000:
+    expired = waste_by_reason.get(WasteReason.EXPIRED.value, 0)
+    if expired > 20000 * window_scale:
         recommendations.append({
             "type": "expiry_management",
             "priority": "high",
-            "issue": f"High expiry waste: PKR {waste_by_reason['expired']:,.2f}",
+            "issue": f"High expiry waste: PKR {expired:,.2f}",
             "recommendation": "Implement FIFO inventory management and better demand forecasting",
-            "potential_savings": waste_by_reason["expired"] * 0.5
+            "potential_savings": expired * 0.5
         })
     
-    if "production-loss" in waste_by_reason and waste_by_reason["production-loss"] > 15000:
+    production_loss = waste_by_reason.get(WasteReason.PRODUCTION_LOSS.value, 0)
+    if production_loss > 15000 * window_scale:
         recommendations.append({
             "type": "production_efficiency",
             "priority": "medium",
-            "issue": f"High production loss: PKR {waste_by_reason['production-loss']:,.2f}",
+            "issue": f"High production loss: PKR {production_loss:,.2f}",
             "recommendation": "Review production processes and equipment maintenance",
-            "potential_savings": waste_by_reason["production-loss"] * 0.4
+            "potential_savings": production_loss * 0.4
         })
     
+    total_waste_value = float(frame["value"].sum())
     total_potential_savings = sum(r["potential_savings"] for r in recommendations)
     
+    def ranking(column: str) -> list:
+        ranked = by_item.nlargest(top_n, column)
+        # to_dict converts NumPy scalars to Python ones for the JSON response
+        return [{"item": item, column: value} for item, value in ranked[column].to_dict().items()]
+    
     return {
+        "lookback_days": days,
         "waste_summary": {
-            "total_waste_value": sum(waste_by_reason.values()),
-            "waste_by_item": dict(sorted_waste_items[:10]),
+            "total_waste_value": total_waste_value,
+            "waste_by_item": top_items.to_dict(orient="index"),
             "waste_by_reason": waste_by_reason,
             "monthly_trends": waste_trends
         },
+        "rankings": {
+            "by_value": ranking("total_value"),
+            "by_quantity": ranking("total_quantity"),
+            "by_occurrences": ranking("occurrences")
+        },
+        "item_month_matrix": {
+            "months": matrix_months,
+            "items": matrix_items
+        },
         "recommendations": recommendations,
         "total_potential_savings": total_potential_savings,
         "roi_analysis": {
-            "current_monthly_waste": sum(waste_by_reason.values()) / 3,  # 3 months average
-            "potential_monthly_savings": total_potential_savings / 3,
-            "annual_savings_potential": total_potential_savings * 4
+            "current_monthly_waste": total_waste_value / months_covered,
+            "potential_monthly_savings": total_potential_savings / months_covered,
+            # Four 90-day windows a year
+            "annual_savings_potential": total_potential_savings * 4 / window_scale
         }
     }
 
-@router.get("/profit-optimization")
-def get_profit_optimization(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Profit optimization analysis and recommendations"""
-    
-    # Get production and sales data
-    productions = db.query(Production).filter(
-        Production.status == "completed"
+@precomputed("profit_optimization")
+def compute_profit_optimization(db: Session) -> dict:
+    """Profit optimization analysis and recommendations
+    
+    Per-product unit costs come from one join of finished products to their
+    completed productions, grouped by product, so the cost of the analysis
+    grows with the number of productions rather than products x productions.
+    """
+    
+    completed = Production.status == ProductionStatus.COMPLETED
+    rows = db.query(
+        FinishedProduct.id,
+        FinishedProduct.name,
+        FinishedProduct.sku,
+        FinishedProduct.selling_price,
+        FinishedProduct.quantity,
+        func.sum(Production.total_cost).label("total_cost"),
+        func.sum(Production.actual_quantity).label("units_produced"),
+    ).join(Production, Production.product_id == FinishedProduct.id).filter(completed).group_by(
+        FinishedProduct.id
     ).all()
     
-    finished_products = db.query(FinishedProduct).all()
-    
     # Calculate profit margins by product
     product_profitability = {}
     
-    for product in finished_products:
-        # Find related productions
-        product_productions = [p for p in productions if p.product_id == product.id]
+    for row in rows:
+        # Average cost over average units is total cost over total units
+        units_produced = row.units_produced or 0
+        cost_per_unit = (row.total_cost or 0) / units_produced if units_produced > 0 else 0
+        selling_price = row.selling_price or 0
+        stock = row.quantity or 0
         
-        if product_productions:
-            avg_production_cost = sum(p.total_cost for p in product_productions) / len(product_productions)
-            avg_units_produced = sum(p.actual_quantity for p in product_productions) / len(product_productions)
-            cost_per_unit = avg_production_cost / avg_units_produced if avg_units_produced > 0 else 0
-            
-            profit_per_unit = product.selling_price - cost_per_unit
-            profit_margin = (profit_per_unit / product.selling_price * 100) if product.selling_price > 0 else 0
-            
-            product_profitability[product.name] = {
-                "cost_per_unit": cost_per_unit,
-                "selling_price": product.selling_price,
-                "profit_per_unit": profit_per_unit,
-                "profit_margin": profit_margin,
-                "current_stock": product.quantity,
-                "potential_revenue": product.quantity * product.selling_price,
-                "potential_profit": product.quantity * profit_per_unit
-            }
+        profit_per_unit = selling_price - cost_per_unit
+        profit_margin = (profit_per_unit / selling_price * 100) if selling_price > 0 else 0
+        
+        product_profitability[row.name] = {
+            "product_id": row.id,
+            "sku": row.sku,
+            "cost_per_unit": cost_per_unit,
+            "selling_price": selling_price,
+            "profit_per_unit": profit_per_unit,
+            "profit_margin": profit_margin,
+            "current_stock": stock,
+            "potential_revenue": stock * selling_price,
+            "potential_profit": stock * profit_per_unit
+        }
     
     # Generate optimization recommendations
     optimization_recommendations = []
@@ -250,9 +387,16 @@ def get_profit_optimization(
         })
     
     # Cost reduction opportunities
-    total_production_cost = sum(p.total_cost for p in productions)
-    avg_labor_percentage = sum(p.labor_cost / p.total_cost for p in productions if p.total_cost > 0) / len(productions) * 100
-    avg_overhead_percentage = sum(p.overhead_cost / p.total_cost for p in productions if p.total_cost > 0) / len(productions) * 100
+    has_cost = Production.total_cost > 0
+    costs = db.query(
+        func.coalesce(func.sum(Production.total_cost), 0).label("total_cost"),
+        func.coalesce(func.sum(Production.labor_cost / Production.total_cost).filter(has_cost), 0).label("labor_share"),
+        func.coalesce(func.sum(Production.overhead_cost / Production.total_cost).filter(has_cost), 0).label("overhead_share"),
+        func.count(Production.id).label("productions"),
+    ).filter(completed).one()
+    total_production_cost = costs.total_cost
+    avg_labor_percentage = costs.labor_share / costs.productions * 100 if costs.productions else 0
+    avg_overhead_percentage = costs.overhead_share / costs.productions * 100 if costs.productions else 0
     
     if avg_labor_percentage > 30:
         optimization_recommendations.append({
@@ -298,60 +442,98 @@ def get_profit_optimization(
         }
     }
 
-@router.get("/efficiency-metrics")
-def get_efficiency_metrics(
-    db: Session = Depends(get_db),
+ProfitabilitySort = Literal[
+    "name", "cost_per_unit", "selling_price", "profit_per_unit", "profit_margin",
+    "current_stock", "potential_revenue", "potential_profit",
+]
+
+@router.get("/profit-optimization")
+def get_profit_optimization(
+    sort_by: ProfitabilitySort = "profit_margin",
+    sort_order: Literal["asc", "desc"] = "desc",
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
+    """Profit optimization analysis and recommendations, served from the latest precomputed snapshot
+    
+    The product profitability table is sorted and paginated; recommendations
+    and summary metrics always cover every product.
+    """
+    result = serve_snapshot("profit_optimization", db)
+    
+    table = result["product_profitability"]
+    ordered = sorted(
+        table.items(),
+        key=lambda item: item[0] if sort_by == "name" else item[1][sort_by],
+        reverse=sort_order == "desc",
+    )
+    offset = (page - 1) * page_size
+    
+    result["product_profitability"] = dict(ordered[offset:offset + page_size])
+    result["pagination"] = {
+        "page": page,
+        "page_size": page_size,
+        "total_items": len(ordered),
+        "total_pages": (len(ordered) + page_size - 1) // page_size,
+        "sort_by": sort_by,
+        "sort_order": sort_order,
+    }
+    return result
+
+@precomputed("efficiency_metrics")
+def compute_efficiency_metrics(db: Session) -> dict:
     """Calculate comprehensive efficiency metrics"""
     
-    # Overall Equipment Effectiveness (OEE)
-    productions = db.query(Production).filter(
-        Production.status == "completed"
-    ).all()
-    
-    if not productions:
+    # Overall Equipment Effectiveness (OEE), aggregated over completed productions
+    completed = Production.status == ProductionStatus.COMPLETED
+    # Whole days between start and end, at 8 working hours a day
+    production_hours = extract("day", Production.end_date - Production.start_date) * 8
+    totals = db.query(
+        func.count(Production.id).label("productions"),
+        func.coalesce(func.sum(production_hours), 0).label("hours"),
+        func.coalesce(func.sum(Production.planned_quantity), 0).label("planned_output"),
+        func.coalesce(func.sum(Production.actual_quantity), 0).label("actual_output"),
+        func.coalesce(func.sum(Production.actual_quantity).filter(Production.quality_grade == "A"), 0).label("grade_a_output"),
+    ).filter(completed).one()
+    
+    if not totals.productions:
         return {"error": "No completed productions found"}
     
     # Availability (planned vs actual production time)
-    total_planned_time = len(productions) * 8  # Assuming 8 hours per production
-    total_actual_time = sum(
-        (datetime.strptime(p.end_date, '%Y-%m-%d') - datetime.strptime(p.start_date, '%Y-%m-%d')).days * 8
-        for p in productions
-    )
+    total_planned_time = totals.productions * 8  # Assuming 8 hours per production
+    total_actual_time = float(totals.hours)
     availability = (total_actual_time / total_planned_time * 100) if total_planned_time > 0 else 0
     
     # Performance (actual vs planned output)
-    total_planned_output = sum(p.planned_quantity for p in productions)
-    total_actual_output = sum(p.actual_quantity for p in productions)
+    total_planned_output = totals.planned_output
+    total_actual_output = totals.actual_output
     performance = (total_actual_output / total_planned_output * 100) if total_planned_output > 0 else 0
     
     # Quality (good units vs total units)
-    total_quality_grade_a = sum(p.actual_quantity for p in productions if p.quality_grade == 'A')
+    total_quality_grade_a = totals.grade_a_output
     quality = (total_quality_grade_a / total_actual_output * 100) if total_actual_output > 0 else 0
     
     # Overall Equipment Effectiveness
     oee = (availability * performance * quality) / 10000  # Divide by 10000 because we're multiplying percentages
     
     # Resource utilization
-    raw_materials = db.query(RawMaterial).all()
-    total_raw_material_value = sum(rm.quantity * rm.cost_per_unit for rm in raw_materials)
+    total_raw_material_value = db.query(
+        func.coalesce(func.sum(RawMaterial.quantity * RawMaterial.cost_per_unit), 0)
+    ).scalar()
     
     # Calculate inventory turnover
-    total_material_used = sum(
-        sum(rm['actual_quantity'] * rm.get('unit_cost', 0) for rm in p.raw_materials_used)
-        for p in productions
-    )
+    total_material_used = db.query(
+        func.coalesce(func.sum(ProductionMaterialUsage.actual_quantity * ProductionMaterialUsage.unit_cost), 0)
+    ).join(Production, Production.id == ProductionMaterialUsage.production_id).filter(completed).scalar()
     inventory_turnover = (total_material_used / total_raw_material_value) if total_raw_material_value > 0 else 0
     
     # Energy efficiency (mock calculation - would need actual energy data)
     energy_efficiency = 85.5  # Placeholder
     
     # Labor productivity
-    total_labor_hours = sum(
-        (datetime.strptime(p.end_date, '%Y-%m-%d') - datetime.strptime(p.start_date, '%Y-%m-%d')).days * 8
-        for p in productions
-    )
+    total_labor_hours = total_actual_time
     labor_productivity = total_actual_output / total_labor_hours if total_labor_hours > 0 else 0
     
     return {
@@ -399,10 +581,18 @@ def get_efficiency_metrics(
         ]
     }
 
+@router.get("/efficiency-metrics")
+def get_efficiency_metrics(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Comprehensive efficiency metrics, served from the latest precomputed snapshot"""
+    return serve_snapshot("efficiency_metrics", db)
+
 @router.post("/cost-reduction-plan")
 def create_cost_reduction_plan(
     target_reduction_percentage: float,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a comprehensive cost reduction plan"""
@@ -1,8 +1,12 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
-from app.api.deps import get_db, get_current_user, get_current_admin_user
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from app.api.deps import (
+    get_db, get_async_db, get_current_user, get_current_admin_user,
+    get_async_current_user, get_async_current_admin_user,
+)
 from app.models.user import User
 from app.models.employee import Employee, Attendance, Leave, Payroll, Department, EmployeeStatus
 from datetime import datetime, date
@@ -11,22 +15,22 @@ import calendar
 router = APIRouter()
 
 @router.get("/employees")
-def get_employees(
+async def get_employees(
     skip: int = 0,
     limit: int = 100,
     department: str = None,
     status: str = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_async_current_user)
 ):
-    query = db.query(Employee)
+    query = select(Employee)
     
     if department:
         query = query.filter(Employee.department == department)
     if status:
         query = query.filter(Employee.status == status)
     
-    employees = query.offset(skip).limit(limit).all()
+    employees = (await db.scalars(query.offset(skip).limit(limit))).all()
     return employees
 
 @router.post("/employees")
@@ -50,14 +54,14 @@ def create_employee(
     return employee
 
 @router.get("/attendance")
-def get_attendance(
+async def get_attendance(
     employee_id: int = None,
     date_from: date = None,
     date_to: date = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_async_current_user)
 ):
-    query = db.query(Attendance)
+    query = select(Attendance)
     
     if employee_id:
         query = query.filter(Attendance.employee_id == employee_id)
@@ -66,7 +70,7 @@ def get_attendance(
     if date_to:
         query = query.filter(Attendance.date <= date_to)
     
-    attendance = query.all()
+    attendance = (await db.scalars(query)).all()
     return attendance
 
 @router.post("/attendance")
@@ -82,20 +86,20 @@ def mark_attendance(
     return attendance
 
 @router.get("/leaves")
-def get_leaves(
+async def get_leaves(
     employee_id: int = None,
     status: str = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_async_current_user)
 ):
-    query = db.query(Leave)
+    query = select(Leave)
     
     if employee_id:
         query = query.filter(Leave.employee_id == employee_id)
     if status:
         query = query.filter(Leave.status == status)
     
-    leaves = query.all()
+    leaves = (await db.scalars(query)).all()
     return leaves
 
 @router.post("/leaves")
@@ -127,14 +131,14 @@ def approve_leave(
     return leave
 
 @router.get("/payroll")
-def get_payroll(
+async def get_payroll(
     employee_id: int = None,
     month: int = None,
     year: int = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_async_current_admin_user)
 ):
-    query = db.query(Payroll)
+    query = select(Payroll)
     
     if employee_id:
         query = query.filter(Payroll.employee_id == employee_id)
@@ -143,7 +147,7 @@ def get_payroll(
     if year:
         query = query.filter(Payroll.year == year)
     
-    payroll = query.all()
+    payroll = (await db.scalars(query)).all()
     return payroll
 
 @router.post("/payroll/generate")
@@ -156,22 +160,26 @@ def generate_payroll(
     # Get all active employees
     employees = db.query(Employee).filter(Employee.status == EmployeeStatus.ACTIVE).all()
     
+    # Date range instead of extract() so the (employee_id, date) index applies
+    days_in_month = calendar.monthrange(year, month)[1]
+    month_start = date(year, month, 1)
+    month_end = date(year, month, days_in_month)
+    
     payroll_records = []
     for employee in employees:
         # Calculate working days and attendance
-        days_in_month = calendar.monthrange(year, month)[1]
         attendance_count = db.query(Attendance).filter(
             Attendance.employee_id == employee.id,
-            extract('month', Attendance.date) == month,
-            extract('year', Attendance.date) == year,
+            Attendance.date >= month_start,
+            Attendance.date <= month_end,
             Attendance.status == 'present'
         ).count()
         
         # Calculate overtime
         overtime_hours = db.query(func.sum(Attendance.overtime_hours)).filter(
             Attendance.employee_id == employee.id,
-            extract('month', Attendance.date) == month,
-            extract('year', Attendance.date) == year
+            Attendance.date >= month_start,
+            Attendance.date <= month_end
         ).scalar() or 0
         
         # Calculate salary components
@@ -202,27 +210,29 @@ def generate_payroll(
     return {"message": f"Payroll generated for {len(payroll_records)} employees", "records": payroll_records}
 
 @router.get("/dashboard")
-def get_hrm_dashboard(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_hrm_dashboard(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_async_current_user)
 ):
-    total_employees = db.query(Employee).filter(Employee.status == EmployeeStatus.ACTIVE).count()
+    total_employees = await db.scalar(
+        select(func.count(Employee.id)).filter(Employee.status == EmployeeStatus.ACTIVE)
+    )
     
     # Attendance today
     today = date.today()
-    present_today = db.query(Attendance).filter(
+    present_today = await db.scalar(select(func.count(Attendance.id)).filter(
         Attendance.date == today,
         Attendance.status == 'present'
-    ).count()
+    ))
     
     # Pending leaves
-    pending_leaves = db.query(Leave).filter(Leave.status == 'pending').count()
+    pending_leaves = await db.scalar(select(func.count(Leave.id)).filter(Leave.status == 'pending'))
     
     # Department wise count
-    dept_counts = db.query(
+    dept_counts = (await db.execute(select(
         Employee.department,
         func.count(Employee.id).label('count')
-    ).filter(Employee.status == EmployeeStatus.ACTIVE).group_by(Employee.department).all()
+    ).filter(Employee.status == EmployeeStatus.ACTIVE).group_by(Employee.department))).all()
     
     return {
         "total_employees": total_employees,
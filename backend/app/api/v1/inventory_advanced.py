@@ -2,12 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, or_
 from app.api.deps import get_db, get_current_user
+from app.core.precompute import precomputed, serve_snapshot
 from app.models.user import User
 from app.models.inventory import RawMaterial, FinishedProduct
-from app.models.production import Production
+from app.models.production import Production, ProductionMaterialUsage, ProductionStatus
 from app.models.waste import WasteRecord
 from typing import List, Optional
-import pandas as pd
 import io
 from datetime import datetime, date, timedelta
 
@@ -20,6 +20,8 @@ async def bulk_import_raw_materials(
     current_user: User = Depends(get_current_user)
 ):
     """Bulk import raw materials from CSV/Excel file"""
+    # pandas is imported on first use to keep it out of worker startup
+    import pandas as pd
     
     if not file.filename.endswith(('.csv', '.xlsx', '.xls')):
         raise HTTPException(status_code=400, detail="File must be CSV or Excel format")
@@ -130,6 +132,7 @@ def export_raw_materials(
     current_user: User = Depends(get_current_user)
 ):
     """Export raw materials to CSV or Excel"""
+    import pandas as pd
     
     materials = db.query(RawMaterial).all()
     
@@ -298,11 +301,8 @@ def advanced_inventory_search(
         }
     }
 
-@router.get("/inventory-optimization")
-def get_inventory_optimization(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
+@precomputed("inventory_optimization")
+def compute_inventory_optimization(db: Session) -> dict:
     """Get inventory optimization recommendations"""
     
     # Get inventory data
@@ -310,9 +310,11 @@ def get_inventory_optimization(
     finished_products = db.query(FinishedProduct).all()
     
     # Get production and waste data for analysis
-    productions = db.query(Production).filter(
-        Production.status == "completed"
-    ).all()
+    usage_by_material = dict(db.query(
+        ProductionMaterialUsage.material_id, func.sum(ProductionMaterialUsage.actual_quantity)
+    ).join(Production, Production.id == ProductionMaterialUsage.production_id).filter(
+        Production.status == ProductionStatus.COMPLETED
+    ).group_by(ProductionMaterialUsage.material_id).all())
     
     waste_records = db.query(WasteRecord).filter(
         WasteRecord.date >= date.today() - timedelta(days=90)
@@ -323,10 +325,7 @@ def get_inventory_optimization(
     # Analyze raw materials
     for material in raw_materials:
         # Calculate usage rate
-        material_usage = sum(
-            sum(rm['actual_quantity'] for rm in p.raw_materials_used if rm['material_id'] == material.id)
-            for p in productions
-        )
+        material_usage = usage_by_material.get(material.id, 0)
         
         # Calculate waste rate
         material_waste = sum(
@@ -430,4 +429,12 @@ def get_inventory_optimization(
             "overstock_items": len([r for r in recommendations if r["type"] in ["overstock", "overproduction"]]),
             "high_waste_items": len([r for r in recommendations if r["type"] == "high_waste"])
         }
-    }
\ No newline at end of file
+    }
+
+@router.get("/inventory-optimization")
+def get_inventory_optimization(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Inventory optimization recommendations, served from the latest precomputed snapshot"""
+    return serve_snapshot("inventory_optimization", db)
@@ -2,17 +2,13 @@ from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func, extract
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_read_db, get_current_user
+from app.core.response_cache import cached_response
 from app.models.user import User
 from app.models.invoice import Invoice, Payment
 from app.models.sales import SalesOrder
 from app.models.inventory import RawMaterial, FinishedProduct
 from app.models.employee import Employee, Payroll
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
 from io import BytesIO
 import os
 from datetime import datetime, date
@@ -22,6 +18,13 @@ router = APIRouter()
 
 def create_invoice_pdf(invoice_data: dict, customer_data: dict, company_data: dict):
     """Generate PDF invoice"""
+    # reportlab is imported on first use to keep it out of worker startup
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4)
     styles = getSampleStyleSheet()
@@ -129,7 +132,7 @@ def create_invoice_pdf(invoice_data: dict, customer_data: dict, company_data: di
 @router.get("/invoice/{invoice_id}/pdf")
 def generate_invoice_pdf(
     invoice_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
@@ -179,11 +182,12 @@ def generate_invoice_pdf(
     )
 
 @router.get("/sales-report")
+@cached_response(SalesOrder)
 def generate_sales_report(
     start_date: date,
     end_date: date,
     format: str = "json",
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     # Sales data
@@ -236,6 +240,11 @@ def generate_sales_report(
     }
     
     if format == "pdf":
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import A4
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+        from reportlab.lib.styles import getSampleStyleSheet
+        
         # Generate PDF report
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=A4)
@@ -303,9 +312,10 @@ def generate_sales_report(
     return report_data
 
 @router.get("/inventory-report")
+@cached_response(RawMaterial, FinishedProduct)
 def generate_inventory_report(
     format: str = "json",
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     # Raw materials
@@ -351,11 +361,12 @@ def generate_inventory_report(
     return report_data
 
 @router.get("/financial-report")
+@cached_response(Invoice, Payroll)
 def generate_financial_report(
     start_date: date,
     end_date: date,
     format: str = "json",
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     # Revenue from invoices
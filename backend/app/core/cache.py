@@ -0,0 +1,73 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after a time-to-live"""
+
+    def __init__(self, max_size: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        """Store a value until `expires_at` (clock time), or for the default TTL"""
+        if self.max_size <= 0:
+            return
+        if expires_at is None:
+            expires_at = self.clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+def render_cache_metrics(lines: list, caches: dict) -> None:
+    """Append hit/miss/eviction counters and sizes for named caches in Prometheus format"""
+    counters = {
+        "app_cache_hits_total": lambda cache: cache.hits,
+        "app_cache_misses_total": lambda cache: cache.misses,
+        "app_cache_evictions_total": lambda cache: cache.evictions,
+        "app_cache_hit_ratio": lambda cache: cache.hit_ratio(),
+        "app_cache_entries": len,
+    }
+    for metric, read in counters.items():
+        kind = "counter" if metric.endswith("_total") else "gauge"
+        lines.append(f"# TYPE {metric} {kind}")
+        for name, cache in caches.items():
+            lines.append(f'{metric}{{cache="{name}"}} {read(cache)}')
@@ -0,0 +1,156 @@
+import bisect
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+# Latency buckets in seconds, tuned for DB waits and API handlers
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Response size buckets in bytes
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+class Histogram:
+    """Cumulative bucketed histogram, cheap enough to observe on hot paths"""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def _read(self) -> Tuple[List[int], int, float]:
+        with self._lock:
+            return list(self.counts), self.count, self.sum
+
+    def cumulative_buckets(self, counts: List[int]) -> List[Tuple[float, int]]:
+        cumulative = 0
+        result = []
+        for upper_bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            result.append((upper_bound, cumulative))
+        return result
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating inside the matching bucket"""
+        counts, total, _ = self._read()
+        if total == 0:
+            return 0.0
+
+        rank = q * total
+        seen = 0
+        lower = 0.0
+        for upper, bucket_count in zip(self.buckets, counts):
+            if bucket_count and seen + bucket_count >= rank:
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+            lower = upper
+        # Rank falls in the +Inf bucket: the largest finite bound is the best estimate
+        return self.buckets[-1]
+
+    def snapshot(self) -> dict:
+        counts, total, total_sum = self._read()
+        buckets = {
+            "+Inf" if upper == float("inf") else str(upper): cumulative
+            for upper, cumulative in self.cumulative_buckets(counts)
+        }
+        return {"count": total, "sum": total_sum, "buckets": buckets}
+
+class RequestMetrics:
+    """Per-route request statistics keyed by (method, route template)"""
+
+    def __init__(self):
+        self.requests: Dict[Tuple[str, str, int], int] = defaultdict(int)
+        self.in_flight: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.response_size: Dict[Tuple[str, str], Histogram] = {}
+
+    def start(self, key: Tuple[str, str]) -> None:
+        self.in_flight[key] += 1
+
+    def finish(self, key: Tuple[str, str], status: int, duration: float, size: int) -> None:
+        self.in_flight[key] -= 1
+        self.requests[key + (status,)] += 1
+
+        latency = self.latency.get(key)
+        if latency is None:
+            latency = self.latency.setdefault(key, Histogram())
+            self.response_size.setdefault(key, Histogram(SIZE_BUCKETS))
+        latency.observe(duration)
+        self.response_size[key].observe(size)
+
+request_metrics = RequestMetrics()
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+def render_histogram(lines: List[str], name: str, histogram: Histogram, **labels) -> None:
+    counts, total, total_sum = histogram._read()
+    for upper, cumulative in histogram.cumulative_buckets(counts):
+        lines.append(f"{name}_bucket{_labels(**labels, le=_format_bound(upper))} {cumulative}")
+    lines.append(f"{name}_sum{_labels(**labels)} {total_sum}")
+    lines.append(f"{name}_count{_labels(**labels)} {total}")
+
+def render_prometheus(extra_collectors: Iterable = ()) -> str:
+    """Render all metrics in the Prometheus text exposition format"""
+    metrics = request_metrics
+    lines = [
+        "# HELP http_requests_total Total HTTP requests by route template and status.",
+        "# TYPE http_requests_total counter",
+    ]
+    for (method, route, status), count in sorted(metrics.requests.items()):
+        lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+    lines += [
+        "# HELP http_requests_in_flight Requests currently being served.",
+        "# TYPE http_requests_in_flight gauge",
+    ]
+    for (method, route), count in sorted(metrics.in_flight.items()):
+        lines.append(f"http_requests_in_flight{_labels(method=method, route=route)} {count}")
+
+    lines += [
+        "# HELP http_request_duration_seconds Request latency.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route), histogram in sorted(metrics.latency.items()):
+        render_histogram(lines, "http_request_duration_seconds", histogram, method=method, route=route)
+
+    lines += [
+        "# HELP http_request_latency_seconds Request latency quantiles estimated from the histogram.",
+        "# TYPE http_request_latency_seconds summary",
+    ]
+    for (method, route), histogram in sorted(metrics.latency.items()):
+        for q in QUANTILES:
+            lines.append(
+                f"http_request_latency_seconds{_labels(method=method, route=route, quantile=q)} "
+                f"{histogram.quantile(q)}"
+            )
+        lines.append(f"http_request_latency_seconds_sum{_labels(method=method, route=route)} {histogram.sum}")
+        lines.append(f"http_request_latency_seconds_count{_labels(method=method, route=route)} {histogram.count}")
+
+    lines += [
+        "# HELP http_response_size_bytes Response body size.",
+        "# TYPE http_response_size_bytes histogram",
+    ]
+    for (method, route), histogram in sorted(metrics.response_size.items()):
+        render_histogram(lines, "http_response_size_bytes", histogram, method=method, route=route)
+
+    for collector in extra_collectors:
+        collector(lines)
+
+    return "\n".join(lines) + "\n"
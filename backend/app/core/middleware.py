@@ -0,0 +1,101 @@
+import logging
+import time
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.metrics import request_metrics
+from app.db.instrumentation import QueryStats, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+# Unmatched paths share one label so scanners cannot explode cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+ROUTE_CACHE_SIZE = 10_000
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route count, latency, size and in-flight"""
+
+    def __init__(self, app: ASGIApp, router=None):
+        self.app = app
+        self.router = router
+        self._route_cache = {}
+
+    def resolve_route(self, scope: Scope) -> str:
+        cache_key = (scope["method"], scope["path"])
+        route = self._route_cache.get(cache_key)
+        if route is None:
+            route = UNMATCHED_ROUTE
+            for candidate in self.router.routes:
+                match, _ = candidate.matches(scope)
+                if match == Match.FULL:
+                    route = candidate.path
+                    break
+            if len(self._route_cache) >= ROUTE_CACHE_SIZE:
+                self._route_cache.clear()
+            self._route_cache[cache_key] = route
+        return route
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.router is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = (scope["method"], self.resolve_route(scope))
+        scope["route_template"] = key[1]
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        request_metrics.start(key)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_metrics.finish(key, status, time.perf_counter() - start, size)
+
+class QueryStatsMiddleware:
+    """Counts SQL statements per request, flags N+1 patterns and, in debug
+    mode, reports X-DB-Queries / X-DB-Time response headers"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope.get("route_template") or scope["path"])
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Queries"] = str(stats.count)
+                headers["X-DB-Time"] = f"{stats.total_time * 1000:.2f}"
+                headers["X-DB-Slowest"] = f"{stats.slowest_time * 1000:.2f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            for shape, count in stats.repeated_shapes(settings.N_PLUS_ONE_THRESHOLD):
+                logger.warning(
+                    "Possible N+1 in %s %s: statement executed %d times: %s",
+                    scope["method"], stats.route, count, shape[:500]
+                )
+            if stats.count:
+                logger.debug(
+                    "%s %s: %d queries, %.2fms total, slowest %.2fms: %s",
+                    scope["method"], stats.route, stats.count, stats.total_time * 1000,
+                    stats.slowest_time * 1000, (stats.slowest_statement or "")[:500]
+                )
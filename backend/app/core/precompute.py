@@ -0,0 +1,176 @@
+"""
+Precomputed snapshots of heavy analytics.
+
+Endpoints whose results take seconds to compute register their compute
+function with @precomputed(name). The Celery beat schedule in app.worker
+refreshes every registered snapshot on a cadence, and endpoints serve the
+latest snapshot with its age instead of computing inside the request.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable, Dict
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.redis_client import connect_redis
+from app.db.database import ReadSessionLocal, SessionLocal
+from app.models.analytics import AnalyticsSnapshot
+
+logger = logging.getLogger(__name__)
+
+REFRESH_MARKER_PREFIX = "precompute_refresh:"
+
+# name -> compute(db) returning a JSON-serializable dict
+registry: Dict[str, Callable[[Session], dict]] = {}
+
+# Serializes the inline compute of a snapshot that does not exist yet
+_compute_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+
+# Refreshes queued by this worker, used when Redis is unavailable
+_queued_refreshes = TTLCache(max_size=1_000, ttl=settings.PRECOMPUTE_INTERVAL_SECONDS)
+
+_redis = None
+_redis_lock = threading.Lock()
+
+def precomputed(name: str):
+    """Register a compute function for background precomputation"""
+    def decorate(func):
+        registry[name] = func
+        return func
+    return decorate
+
+def store_snapshot(name: str, payload: dict, duration: float) -> AnalyticsSnapshot:
+    snapshot = AnalyticsSnapshot(
+        name=name,
+        payload=jsonable_encoder(payload),
+        computed_at=datetime.utcnow(),
+        duration_ms=duration * 1000,
+    )
+    db = SessionLocal()
+    try:
+        snapshot = db.merge(snapshot)
+        db.commit()
+        db.refresh(snapshot)
+        db.expunge(snapshot)
+    finally:
+        db.close()
+    return snapshot
+
+def _stored_snapshot(name: str):
+    # Read from the primary, where snapshots are written
+    db = SessionLocal()
+    try:
+        snapshot = db.get(AnalyticsSnapshot, name)
+        if snapshot is not None:
+            db.expunge(snapshot)
+        return snapshot
+    finally:
+        db.close()
+
+def compute_snapshot(name: str, db: Session) -> AnalyticsSnapshot:
+    started = time.perf_counter()
+    payload = registry[name](db)
+    duration = time.perf_counter() - started
+    logger.info("Precomputed %s in %.0fms", name, duration * 1000)
+    return store_snapshot(name, payload, duration)
+
+def refresh_snapshot(name: str) -> AnalyticsSnapshot:
+    """Recompute a snapshot from the read replica and store it on the primary"""
+    db = ReadSessionLocal()
+    try:
+        return compute_snapshot(name, db)
+    finally:
+        db.close()
+
+def _refresh_markers():
+    """Redis client holding the queued-refresh markers, or None without Redis"""
+    global _redis
+    if _redis is None:
+        with _redis_lock:
+            if _redis is None:
+                _redis = connect_redis("snapshot refreshes are deduplicated per worker") or False
+    return _redis or None
+
+def _mark_refresh_queued(name: str) -> bool:
+    """Claim the refresh of `name`; False when one is already queued"""
+    client = _refresh_markers()
+    if client is not None:
+        from redis import RedisError
+
+        try:
+            # The marker lapses with the task (see app.worker), so a lost task is requeued later
+            return bool(client.set(
+                REFRESH_MARKER_PREFIX + name, 1, nx=True, ex=max(1, int(settings.PRECOMPUTE_INTERVAL_SECONDS))
+            ))
+        except RedisError as exc:
+            logger.warning("Could not mark a refresh of %s in Redis (%s); deduplicating per worker", name, exc)
+    if _queued_refreshes.get(name) is not None:
+        return False
+    _queued_refreshes.set(name, True)
+    return True
+
+def clear_refresh_marker(name: str) -> None:
+    """Let the next stale request queue a refresh of `name` again"""
+    _queued_refreshes.invalidate(name)
+    client = _refresh_markers()
+    if client is not None:
+        from redis import RedisError
+
+        try:
+            client.delete(REFRESH_MARKER_PREFIX + name)
+        except RedisError as exc:
+            logger.warning("Could not clear the refresh marker of %s: %s", name, exc)
+
+def request_refresh(name: str, force: bool = False) -> bool:
+    """Queue a background refresh unless one was already queued within the
+    refresh interval (or `force`); False when the task queue is unreachable"""
+    if not _mark_refresh_queued(name) and not force:
+        return True
+    try:
+        # Celery is imported on first use to keep it out of worker startup
+        from app.worker import refresh_snapshot_task
+
+        # No publish retries: with the broker down this fails fast instead of
+        # holding the request while kombu reconnects
+        refresh_snapshot_task.apply_async((name,), retry=False)
+    except Exception as exc:
+        # The marker is kept, so a dead broker is retried once per interval rather than per request
+        logger.warning("Could not queue a refresh of %s: %s", name, exc)
+        return False
+    return True
+
+def serve_snapshot(name: str, db: Session) -> dict:
+    """Latest snapshot of `name` with staleness metadata
+
+    Only computes inside the request when no snapshot exists yet, one request
+    per worker at a time. A snapshot older than PRECOMPUTE_MAX_AGE_SECONDS is
+    still served, and a single refresh is queued for the next request.
+    """
+    snapshot = db.get(AnalyticsSnapshot, name)
+    if snapshot is None:
+        with _compute_locks[name]:
+            # A concurrent request may have stored it while this one waited
+            snapshot = _stored_snapshot(name)
+            if snapshot is None:
+                snapshot = compute_snapshot(name, db)
+
+    age = (datetime.utcnow() - snapshot.computed_at).total_seconds()
+    stale = age > settings.PRECOMPUTE_MAX_AGE_SECONDS
+    if stale:
+        request_refresh(name)
+
+    return {
+        **snapshot.payload,
+        "snapshot": {
+            "computed_at": snapshot.computed_at.isoformat(),
+            "age_seconds": round(age, 1),
+            "stale": stale,
+            "compute_ms": round(snapshot.duration_ms, 1),
+        },
+    }
@@ -0,0 +1,20 @@
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def connect_redis(fallback: str):
+    """Redis client for REDIS_URL, or None (logging `fallback`) when it is unreachable"""
+    if not settings.REDIS_URL:
+        return None
+    try:
+        # redis is imported on first use to keep it out of worker startup
+        import redis
+
+        client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=1, socket_connect_timeout=1)
+        client.ping()
+    except Exception as exc:
+        logger.warning("Redis unavailable at %s (%s); %s", settings.REDIS_URL, exc, fallback)
+        return None
+    return client
@@ -0,0 +1,117 @@
+"""
+Response cache for read-only analytics endpoints.
+
+@cached_response(Model, ...) caches an endpoint's JSON result per endpoint,
+query parameters and day, together with the versions of the tables it reads
+(app.db.table_versions). A cached result is served until a commit touches
+one of those tables, or RESPONSE_CACHE_TTL_SECONDS passes as a backstop for
+writes made outside the ORM.
+
+Versions are bumped when the primary commits, so a result computed on a read
+replica that has not yet replayed that commit would be cached under the new
+versions. Such results are served but not stored.
+"""
+import asyncio
+import datetime
+import functools
+from typing import Tuple
+
+from sqlalchemy import text
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.database import async_engine, async_read_engine, engine, read_engine
+from app.db.table_versions import get_table_versions
+
+# Dependencies that do not change the result
+_IGNORED_PARAMETERS = ("db", "current_user")
+
+response_cache = TTLCache(
+    max_size=settings.RESPONSE_CACHE_MAX_SIZE,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+
+def _cache_key(func, kwargs: dict) -> tuple:
+    parameters = tuple(sorted(
+        (name, repr(value)) for name, value in kwargs.items() if name not in _IGNORED_PARAMETERS
+    ))
+    # Endpoints default their periods to "today", so results also expire at midnight
+    return (func.__module__, func.__qualname__, datetime.date.today().isoformat(), parameters)
+
+def _lookup(key: tuple, tables: Tuple[str, ...]):
+    versions = get_table_versions().get(tables)
+    if versions is None:
+        # Versions unavailable: compute, and do not store what cannot be invalidated
+        return None, None
+    entry = response_cache.get(key)
+    if entry is not None and entry[0] == versions:
+        return versions, entry[1]
+    return versions, None
+
+_PRIMARY_POSITION = text("SELECT pg_current_wal_lsn()")
+_REPLAYED_POSITION = text(
+    "SELECT CASE WHEN pg_is_in_recovery() "
+    "THEN pg_last_wal_replay_lsn() >= CAST(:position AS pg_lsn) ELSE TRUE END"
+)
+
+def _replica_caught_up(db) -> bool:
+    """Whether `db` sees every commit made on the primary so far
+
+    Called after the versions are read, so a True result means the replica
+    has replayed every write those versions account for.
+    """
+    if db is None or read_engine is engine or db.bind is not read_engine:
+        return True
+    with engine.connect() as conn:
+        position = conn.execute(_PRIMARY_POSITION).scalar()
+    return bool(db.execute(_REPLAYED_POSITION, {"position": position}).scalar())
+
+async def _async_replica_caught_up(db) -> bool:
+    if db is None or async_read_engine is async_engine or db.bind is not async_read_engine:
+        return True
+    async with async_engine.connect() as conn:
+        position = (await conn.execute(_PRIMARY_POSITION)).scalar()
+    return bool((await db.execute(_REPLAYED_POSITION, {"position": position})).scalar())
+
+def _store(key: tuple, versions: tuple, result) -> None:
+    # Only plain JSON results; file and streaming responses are never cached
+    if versions is not None and isinstance(result, (dict, list)):
+        response_cache.set(key, (versions, result))
+
+def cached_response(*models):
+    """Cache an endpoint's result until one of `models`' tables is written"""
+    tables = tuple(sorted(model.__tablename__ for model in models))
+
+    def decorate(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(**kwargs):
+                if settings.RESPONSE_CACHE_MAX_SIZE <= 0:
+                    return await func(**kwargs)
+                key = _cache_key(func, kwargs)
+                versions, result = await asyncio.to_thread(_lookup, key, tables)
+                if result is None:
+                    # Versions are read before computing, so a write during the
+                    # computation leaves this entry stale rather than wrong
+                    caught_up = versions is not None and await _async_replica_caught_up(kwargs.get("db"))
+                    result = await func(**kwargs)
+                    if caught_up:
+                        _store(key, versions, result)
+                return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(**kwargs):
+            if settings.RESPONSE_CACHE_MAX_SIZE <= 0:
+                return func(**kwargs)
+            key = _cache_key(func, kwargs)
+            versions, result = _lookup(key, tables)
+            if result is None:
+                caught_up = versions is not None and _replica_caught_up(kwargs.get("db"))
+                result = func(**kwargs)
+                if caught_up:
+                    _store(key, versions, result)
+            return result
+        return wrapper
+
+    return decorate
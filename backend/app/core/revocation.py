@@ -0,0 +1,94 @@
+import logging
+import threading
+import time
+from typing import Dict
+
+from app.core.redis_client import connect_redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "revoked_jti:"
+
+class MemoryRevocationList:
+    """Revoked token ids for a single worker, used when Redis is unavailable"""
+
+    # Expired ids are swept once the list grows past this many entries
+    SWEEP_SIZE = 10_000
+
+    def __init__(self):
+        self._revoked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def revoke(self, jti: str, expires_at: float) -> bool:
+        """Revoke `jti` until `expires_at` (epoch seconds); False if it already was"""
+        now = time.time()
+        with self._lock:
+            current = self._revoked.get(jti)
+            if current is not None and current > now:
+                return False
+            self._revoked[jti] = expires_at
+            if len(self._revoked) > self.SWEEP_SIZE:
+                self._revoked = {key: exp for key, exp in self._revoked.items() if exp > now}
+            return True
+
+    def is_revoked(self, jti: str) -> bool:
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+class RedisRevocationList:
+    """Revoked token ids shared by every worker, expiring with the token
+
+    While Redis errors, revocation degrades to this worker's own list, as it
+    does when Redis is unreachable at startup: tokens revoked in Redis before
+    the outage are accepted again (fail-open) until Redis recovers or they
+    expire, rather than failing every authenticated request.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.local = MemoryRevocationList()
+
+    def revoke(self, jti: str, expires_at: float) -> bool:
+        from redis import RedisError
+
+        ttl = max(1, int(expires_at - time.time()) + 1)
+        try:
+            # SET NX makes revocation atomic, so a refresh token can be rotated only once
+            return bool(self.client.set(REDIS_KEY_PREFIX + jti, 1, ex=ttl, nx=True))
+        except RedisError as exc:
+            logger.warning("Could not revoke token in Redis (%s); revoking in this worker only", exc)
+            return self.local.revoke(jti, expires_at)
+
+    def is_revoked(self, jti: str) -> bool:
+        from redis import RedisError
+
+        try:
+            return bool(self.client.exists(REDIS_KEY_PREFIX + jti))
+        except RedisError as exc:
+            logger.warning("Could not check token revocation in Redis (%s); checking this worker only", exc)
+            return self.local.is_revoked(jti)
+
+_revocation_list = None
+_revocation_lock = threading.Lock()
+
+def get_revocation_list():
+    """Redis-backed revocation list, or an in-memory one when Redis is unreachable"""
+    global _revocation_list
+    if _revocation_list is None:
+        with _revocation_lock:
+            if _revocation_list is None:
+                client = connect_redis("token revocation is per worker")
+                _revocation_list = RedisRevocationList(client) if client else MemoryRevocationList()
+    return _revocation_list
+
+def revoke_token(payload: dict) -> bool:
+    """Revoke a verified token until it expires; False if it was already revoked"""
+    jti = payload.get("jti")
+    if jti is None:
+        return False
+    return get_revocation_list().revoke(jti, payload.get("exp") or time.time())
+
+def is_token_revoked(payload: dict) -> bool:
+    # Tokens issued before revocation support carry no jti and simply run out
+    jti = payload.get("jti")
+    return jti is not None and get_revocation_list().is_revoked(jti)
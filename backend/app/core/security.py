@@ -1,11 +1,91 @@
+import asyncio
+import hashlib
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any, Union, Optional
 from jose import jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.metrics import Histogram, render_histogram
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    # Hashes with fewer rounds report needs_update and are upgraded on login
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+)
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated, bounded thread pool
+
+    Keeps a burst of logins from occupying the request threadpool: at most
+    `workers` hashes run at once, up to `max_queue` more wait, and anything
+    beyond that is refused with a 503 instead of queueing without bound.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_pending = workers + max_queue
+        self.pending = 0
+        self.rejected = 0
+        self.queue_wait = Histogram()
+        self.duration = Histogram()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+
+    def _job(self, submitted: float, fn, args):
+        started = time.perf_counter()
+        self.queue_wait.observe(started - submitted)
+        try:
+            return fn(*args)
+        finally:
+            self.duration.observe(time.perf_counter() - started)
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent logins, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+        try:
+            future = self._executor.submit(self._job, time.perf_counter(), fn, args)
+            return await asyncio.wrap_future(future)
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
+
+def collect_password_hash_metrics(lines: list) -> None:
+    """Append password hashing pool gauges and histograms in Prometheus format"""
+    hasher = password_hasher
+    lines.append("# TYPE password_hash_workers gauge")
+    lines.append(f"password_hash_workers {hasher.workers}")
+    lines.append("# TYPE password_hash_pending gauge")
+    lines.append(f"password_hash_pending {hasher.pending}")
+    lines.append("# TYPE password_hash_rejected_total counter")
+    lines.append(f"password_hash_rejected_total {hasher.rejected}")
+    lines.append("# TYPE password_hash_queue_seconds histogram")
+    render_histogram(lines, "password_hash_queue_seconds", hasher.queue_wait)
+    lines.append("# TYPE password_hash_duration_seconds histogram")
+    render_histogram(lines, "password_hash_duration_seconds", hasher.duration)
+
+# Payloads of tokens whose signature was already checked, keyed by token digest.
+# Entries expire with the token, so an expired token is always re-verified (and rejected).
+verified_token_cache = TTLCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
@@ -16,13 +96,13 @@ def create_access_token(
         expire = datetime.utcnow() + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {"exp": expire, "sub": str(subject), "type": "access", "jti": uuid.uuid4().hex}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 def create_refresh_token(subject: Union[str, Any]) -> str:
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
+    to_encode = {"exp": expire, "sub": str(subject), "type": "refresh", "jti": uuid.uuid4().hex}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -32,14 +112,27 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+async def verify_and_update_password(plain_password: str, hashed_password: str):
+    """(valid, new_hash) computed on the password hashing pool; new_hash is set when the stored hash is outdated"""
+    return await password_hasher.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
 def verify_token(token: str) -> dict:
+    key = hashlib.sha256(token.encode()).digest()
+    payload = verified_token_cache.get(key)
+    if payload is not None:
+        return dict(payload)
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        return payload
     except jwt.JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
-        )
\ No newline at end of file
+        )
+    exp = payload.get("exp")
+    if exp is not None:
+        remaining = exp - time.time()
+        if remaining > 0:
+            verified_token_cache.set(key, dict(payload), verified_token_cache.clock() + remaining)
+    return payload
\ No newline at end of file
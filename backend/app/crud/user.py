@@ -1,8 +1,26 @@
 from typing import Optional, List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_and_update_password
+
+# Authenticated principals keyed by username (the token subject). Entries are
+# dropped by update_user/delete_user once their commit succeeds. Invalidation
+# is per worker: other workers, and changes made outside these functions, keep
+# serving the old principal for up to PRINCIPAL_CACHE_TTL_SECONDS.
+principal_cache = TTLCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+# Column values kept for a cached principal; the password hash stays in the database
+_PRINCIPAL_COLUMNS = tuple(
+    column.key for column in User.__table__.columns if column.key != "hashed_password"
+)
 
 def get_user(db: Session, user_id: int) -> Optional[User]:
     return db.query(User).filter(User.id == user_id).first()
@@ -13,6 +31,35 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
 def get_user_by_username(db: Session, username: str) -> Optional[User]:
     return db.query(User).filter(User.username == username).first()
 
+def get_principal(db: Session, username: str) -> Optional[User]:
+    """User for an authenticated request, served from the principal cache when possible
+
+    Returns a detached copy, so callers can use it after the session closes or
+    commits without touching the cached values.
+    """
+    values = principal_cache.get(username)
+    if values is None:
+        user = get_user_by_username(db, username)
+        if user is None:
+            return None
+        values = _cache_principal(user)
+    return User(**values)
+
+async def get_async_principal(db: AsyncSession, username: str) -> Optional[User]:
+    """get_principal for async endpoints, loading a cache miss through an AsyncSession"""
+    values = principal_cache.get(username)
+    if values is None:
+        user = await db.scalar(select(User).where(User.username == username))
+        if user is None:
+            return None
+        values = _cache_principal(user)
+    return User(**values)
+
+def _cache_principal(user: User) -> dict:
+    values = {key: getattr(user, key) for key in _PRINCIPAL_COLUMNS}
+    principal_cache.set(user.username, values)
+    return values
+
 def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
     return db.query(User).offset(skip).limit(limit).all()
 
@@ -36,25 +83,36 @@ def create_user(db: Session, user: UserCreate) -> User:
 def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[User]:
     db_user = get_user(db, user_id)
     if db_user:
+        username = db_user.username
         update_data = user_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_user, field, value)
         db.commit()
+        # Only after the commit, so a concurrent request cannot re-cache the old row
+        principal_cache.invalidate(username)
         db.refresh(db_user)
+        principal_cache.invalidate(db_user.username)
     return db_user
 
-def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
-    user = get_user_by_username(db, username)
+async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[User]:
+    user = await db.scalar(select(User).where(User.username == username))
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = await verify_and_update_password(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash:
+        # Stored hash used an outdated scheme or cost; replace it while we have the password
+        user.hashed_password = new_hash
+        await db.commit()
     return user
 
 def delete_user(db: Session, user_id: int) -> bool:
     db_user = get_user(db, user_id)
     if db_user:
+        username = db_user.username
         db.delete(db_user)
         db.commit()
+        principal_cache.invalidate(username)
         return True
     return False
\ No newline at end of file
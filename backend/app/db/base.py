@@ -0,0 +1,7 @@
+# Import every model so Base.metadata is complete for Alembic and tooling
+from app.db.database import Base
+from app.models import (
+    user, inventory, supplier, purchase, production,
+    sales, finance, quality, waste, alerts, employee, crm, invoice, dashboard, analytics
+)
+from app.db import counters, material_usage, table_versions, waste_rollup  # noqa: F401 - registers the session hooks
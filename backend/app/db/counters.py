@@ -0,0 +1,229 @@
+"""
+Incrementally maintained dashboard counters.
+
+Each counter is a count or sum over one model, optionally restricted to some
+column values. A before_flush/after_flush pair turns every ORM insert, update
+and delete of a counted model into a delta that is applied to the
+dashboard_counters row in the same transaction, so dashboards read a handful
+of rows instead of scanning tables. Writes that bypass the ORM (COPY, bulk
+UPDATE, raw SQL) are corrected by reconcile_counters, which seed_data runs
+after loading and the app runs periodically.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, bindparam, event, func, inspect, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.database import engine
+from app.models.crm import Lead, LeadStatus, Opportunity
+from app.models.dashboard import DashboardCounter
+from app.models.finance import Transaction, TransactionType
+from app.models.inventory import FinishedProduct, RawMaterial, StockStatus
+from app.models.invoice import Invoice, InvoiceStatus
+from app.models.production import Production, ProductionStatus
+from app.models.sales import SalesOrder, SalesOrderStatus
+from app.models.waste import WasteRecord
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary key for the advisory lock that keeps workers from reconciling at once
+RECONCILE_LOCK_KEY = 0x64617368
+
+class Counter:
+    """COUNT(*) or SUM(sum_column) over `model` rows whose columns match `filters`"""
+
+    def __init__(self, model, sum_column: Optional[str] = None, **filters: Iterable):
+        self.model = model
+        self.sum_column = sum_column
+        self.filters = {key: tuple(values) for key, values in filters.items()}
+        self.columns = set(self.filters) | ({sum_column} if sum_column else set())
+
+    def contribution(self, values: dict) -> float:
+        """What one row with these column values adds to the counter"""
+        for key, allowed in self.filters.items():
+            if values.get(key) not in allowed:
+                return 0
+        if self.sum_column is None:
+            return 1
+        return values.get(self.sum_column) or 0
+
+    def aggregate(self):
+        if self.sum_column is None:
+            expression = func.count()
+        else:
+            expression = func.sum(getattr(self.model, self.sum_column))
+        if self.filters:
+            expression = expression.filter(and_(*(
+                getattr(self.model, key).in_(allowed) for key, allowed in self.filters.items()
+            )))
+        return func.coalesce(expression, 0)
+
+    def cast(self, value: float):
+        return int(value) if self.sum_column is None else value
+
+COUNTERS: Dict[str, Counter] = {
+    # analytics dashboard
+    "raw_materials": Counter(RawMaterial),
+    "raw_materials_low_stock": Counter(RawMaterial, status=[StockStatus.LOW_STOCK]),
+    "finished_products": Counter(FinishedProduct),
+    "transactions_income": Counter(Transaction, "amount", type=[TransactionType.INCOME]),
+    "transactions_expense": Counter(Transaction, "amount", type=[TransactionType.EXPENSE]),
+    "productions_in_progress": Counter(Production, status=[ProductionStatus.IN_PROGRESS]),
+    "productions_completed": Counter(Production, status=[ProductionStatus.COMPLETED]),
+    "waste_value": Counter(WasteRecord, "waste_value"),
+    "sales_total": Counter(SalesOrder, "total_amount"),
+    "sales_orders_open": Counter(SalesOrder, status=[SalesOrderStatus.PENDING, SalesOrderStatus.CONFIRMED]),
+    # CRM dashboard
+    "leads": Counter(Lead),
+    "leads_new": Counter(Lead, status=[LeadStatus.NEW]),
+    "leads_qualified": Counter(Lead, status=[LeadStatus.QUALIFIED]),
+    "opportunities": Counter(Opportunity),
+    "opportunities_value": Counter(Opportunity, "value"),
+    "invoices": Counter(Invoice),
+    "invoices_pending": Counter(Invoice, status=[InvoiceStatus.SENT, InvoiceStatus.OVERDUE]),
+    "invoices_revenue": Counter(Invoice, "total_amount", status=[InvoiceStatus.PAID]),
+}
+
+_COUNTERS_BY_MODEL: Dict[type, Dict[str, Counter]] = defaultdict(dict)
+for _name, _counter in COUNTERS.items():
+    _COUNTERS_BY_MODEL[_counter.model][_name] = _counter
+
+_DELTAS_KEY = "dashboard_counter_deltas"
+
+def _tracked_columns(model) -> set:
+    return set().union(*(counter.columns for counter in _COUNTERS_BY_MODEL[model].values()))
+
+def _current_values(obj, columns: set) -> dict:
+    return {key: getattr(obj, key) for key in columns}
+
+def committed_values(obj, columns: set) -> dict:
+    """Column values as last loaded from the database, before pending changes"""
+    state = inspect(obj)
+    values = {}
+    for key in columns:
+        history = state.attrs[key].load_history()
+        if history.deleted:
+            values[key] = history.deleted[0]
+        elif history.unchanged:
+            values[key] = history.unchanged[0]
+        else:
+            values[key] = None
+    return values
+
+def _tracked_changes(obj) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[key].history.has_changes() for key in _tracked_columns(type(obj)))
+
+def _add(deltas: dict, obj, values: dict, sign: int) -> None:
+    for name, counter in _COUNTERS_BY_MODEL[type(obj)].items():
+        deltas[name] += sign * counter.contribution(values)
+
+@event.listens_for(Session, "before_flush")
+def _collect_old_contributions(session, flush_context, instances):
+    # Old values have to be read before the flush writes over (or deletes) the rows
+    deltas = defaultdict(float)
+    changed = []
+    for obj in session.dirty:
+        if type(obj) in _COUNTERS_BY_MODEL and _tracked_changes(obj):
+            _add(deltas, obj, committed_values(obj, _tracked_columns(type(obj))), -1)
+            changed.append(obj)
+    for obj in session.deleted:
+        if type(obj) in _COUNTERS_BY_MODEL:
+            _add(deltas, obj, committed_values(obj, _tracked_columns(type(obj))), -1)
+    session.info[_DELTAS_KEY] = (deltas, changed)
+
+@event.listens_for(Session, "after_flush")
+def _apply_counter_deltas(session, flush_context):
+    deltas, changed = session.info.pop(_DELTAS_KEY, (defaultdict(float), []))
+    # New values are read after the INSERT, once column defaults are populated
+    for obj in list(session.new) + changed:
+        if type(obj) in _COUNTERS_BY_MODEL:
+            _add(deltas, obj, _current_values(obj, _tracked_columns(type(obj))), 1)
+
+    # Fixed (name) order, so transactions updating the same counters lock them
+    # in the same order instead of deadlocking
+    rows = [{"counter": name, "delta": delta} for name, delta in sorted(deltas.items()) if delta]
+    if rows:
+        table = DashboardCounter.__table__
+        session.connection().execute(
+            update(table)
+            .where(table.c.name == bindparam("counter"))
+            .values(value=table.c.value + bindparam("delta"), updated_at=func.now()),
+            rows,
+        )
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    pass
+
+def track_old_values(model, columns: Iterable[str]) -> None:
+    """Load the old value whenever one of these columns is assigned, so flush
+    hooks can subtract exactly what the row contributed before"""
+    for key in columns:
+        event.listen(getattr(model, key), "set", _keep_old_value, active_history=True)
+
+for _model in _COUNTERS_BY_MODEL:
+    track_old_values(_model, _tracked_columns(_model))
+
+def recount_statement(model):
+    """One SELECT computing every counter kept for `model` from its table"""
+    return select(*(
+        counter.aggregate().label(name) for name, counter in _COUNTERS_BY_MODEL[model].items()
+    )).select_from(model)
+
+def reconcile_counters(conn) -> Optional[dict]:
+    """Recompute every counter from its table; returns the values, or None when
+    another worker is already reconciling
+
+    Must run inside a transaction. On PostgreSQL the EXCLUSIVE lock waits for
+    in-flight writers that touched the counters and holds off new ones, so no
+    delta is lost between the recount and the overwrite.
+    """
+    postgresql = conn.dialect.name == "postgresql"
+    if postgresql:
+        if not conn.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": RECONCILE_LOCK_KEY}).scalar():
+            return None
+        conn.execute(text(f"LOCK TABLE {DashboardCounter.__tablename__} IN EXCLUSIVE MODE"))
+
+    values = {}
+    for model in _COUNTERS_BY_MODEL:
+        values.update(conn.execute(recount_statement(model)).one()._mapping)
+
+    insert = pg_insert if postgresql else sqlite_insert
+    statement = insert(DashboardCounter.__table__).values([
+        {"name": name, "value": value} for name, value in values.items()
+    ])
+    conn.execute(statement.on_conflict_do_update(
+        index_elements=["name"],
+        set_={"value": statement.excluded.value, "updated_at": func.now()},
+    ))
+    return values
+
+def reconcile() -> Optional[dict]:
+    with engine.begin() as conn:
+        return reconcile_counters(conn)
+
+async def reconcile_periodically(interval: float) -> None:
+    """Reconcile the counters every `interval` seconds until cancelled"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            values = await asyncio.to_thread(reconcile)
+        except Exception:
+            logger.exception("Dashboard counter reconcile failed")
+        else:
+            if values is not None:
+                logger.info("Reconciled %d dashboard counters", len(values))
+
+async def read_counters(db: AsyncSession, names: List[str]) -> dict:
+    """Current values of the named counters; counters not reconciled yet read as 0"""
+    rows = (await db.execute(
+        select(DashboardCounter.name, DashboardCounter.value).where(DashboardCounter.name.in_(names))
+    )).all()
+    values = dict(rows)
+    return {name: COUNTERS[name].cast(values.get(name, 0)) for name in names}
@@ -1,11 +1,100 @@
+import time
+from typing import Optional
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
+from app.core.metrics import Histogram, render_histogram
 
-engine = create_engine(settings.DATABASE_URL)
+# Async drivers for the sync URL schemes we deploy with
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+# Header a client sends to read its own writes from the primary
+READ_PRIMARY_HEADER = "X-Read-Primary"
+
+class InstrumentedPoolMixin:
+    """Records checkout wait time and timeouts on the pool class"""
+
+    wait_seconds: Histogram
+    timeouts: int
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            type(self).timeouts += 1
+            raise
+        finally:
+            self.wait_seconds.observe(time.perf_counter() - start)
+
+def instrumented_pool(pool_class):
+    # One class per engine so every pool keeps its own statistics
+    return type(
+        f"Instrumented{pool_class.__name__}",
+        (InstrumentedPoolMixin, pool_class),
+        {"wait_seconds": Histogram(), "timeouts": 0},
+    )
+
+def to_async_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+def get_async_database_url() -> str:
+    return settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL)
+
+def get_async_read_replica_url() -> Optional[str]:
+    if settings.ASYNC_READ_REPLICA_URL:
+        return settings.ASYNC_READ_REPLICA_URL
+    if settings.READ_REPLICA_URL:
+        return to_async_url(settings.READ_REPLICA_URL)
+    return None
+
+pool_options = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+
+engine = create_engine(
+    settings.DATABASE_URL, poolclass=instrumented_pool(QueuePool), **pool_options
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(
+    get_async_database_url(), poolclass=instrumented_pool(AsyncAdaptedQueuePool), **pool_options
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Read replica; both engines fall back to the primary when no replica is configured
+if settings.READ_REPLICA_URL:
+    read_engine = create_engine(
+        settings.READ_REPLICA_URL, poolclass=instrumented_pool(QueuePool), **pool_options
+    )
+    async_read_engine = create_async_engine(
+        get_async_read_replica_url(), poolclass=instrumented_pool(AsyncAdaptedQueuePool), **pool_options
+    )
+else:
+    read_engine = engine
+    async_read_engine = async_engine
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncReadSessionLocal = async_sessionmaker(
+    async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 def get_db():
@@ -13,4 +102,91 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def reads_from_primary(request: Request) -> bool:
+    if read_engine is engine:
+        return True
+    return request.headers.get(READ_PRIMARY_HEADER, "").lower() in ("1", "true", "yes")
+
+def get_read_db(request: Request):
+    """Session on the read replica, or the primary for read-your-writes requests"""
+    if reads_from_primary(request):
+        yield from get_db()
+        return
+
+    db = ReadSessionLocal()
+    try:
+        try:
+            db.connection()
+        except OperationalError:
+            # Replica unreachable: serve the read from the primary instead
+            db.close()
+            db = SessionLocal()
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(request: Request):
+    if reads_from_primary(request):
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    db = AsyncReadSessionLocal()
+    try:
+        try:
+            await db.connection()
+        except OperationalError:
+            await db.close()
+            db = AsyncSessionLocal()
+        yield db
+    finally:
+        await db.close()
+
+def _pool_status(pool) -> dict:
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+        "timeouts": pool.timeouts,
+        "wait_time_seconds": pool.wait_seconds.snapshot(),
+    }
+
+def get_pool_status() -> dict:
+    status = {
+        "sync": _pool_status(engine.pool),
+        "async": _pool_status(async_engine.pool),
+    }
+    if read_engine is not engine:
+        status["read_replica_sync"] = _pool_status(read_engine.pool)
+        status["read_replica_async"] = _pool_status(async_read_engine.pool)
+    return status
+
+def collect_pool_metrics(lines: list) -> None:
+    """Append connection pool gauges and wait histograms in Prometheus format"""
+    pools = {"primary": engine.pool, "primary_async": async_engine.pool}
+    if read_engine is not engine:
+        pools.update(replica=read_engine.pool, replica_async=async_read_engine.pool)
+
+    gauges = {
+        "db_pool_size": lambda pool: pool.size(),
+        "db_pool_checked_out": lambda pool: pool.checkedout(),
+        "db_pool_overflow": lambda pool: max(0, pool.overflow()),
+        "db_pool_timeouts_total": lambda pool: pool.timeouts,
+    }
+    for metric, read in gauges.items():
+        kind = "counter" if metric.endswith("_total") else "gauge"
+        lines.append(f"# TYPE {metric} {kind}")
+        for name, pool in pools.items():
+            lines.append(f'{metric}{{pool="{name}"}} {read(pool)}')
+
+    lines.append("# TYPE db_pool_wait_seconds histogram")
+    for name, pool in pools.items():
+        render_histogram(lines, "db_pool_wait_seconds", pool.wait_seconds, pool=name)
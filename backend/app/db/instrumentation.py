@@ -0,0 +1,166 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|\?")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so repeats with different parameters compare equal"""
+    shape = _PLACEHOLDER.sub("?", statement)
+    shape = _PLACEHOLDER_LIST.sub("?", shape)  # IN (?, ?, ?) -> IN (?)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+class QueryStats:
+    """Statements executed while serving one request"""
+
+    def __init__(self, route: str = ""):
+        self.route = route
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.shapes[statement] += 1
+        if duration > self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+
+    def repeated_shapes(self, threshold: int) -> list:
+        """Statement shapes executed more than `threshold` times (N+1 candidates)"""
+        repeated = Counter()
+        for statement, count in self.shapes.items():
+            repeated[statement_shape(statement)] += count
+        return [(shape, count) for shape, count in repeated.most_common() if count > threshold]
+
+class SlowQueryLog:
+    """Slow statements with their plan, written as JSON lines to a rotating
+    file and kept in memory for the admin endpoint"""
+
+    def __init__(self, max_entries: int = 200):
+        self.entries = deque(maxlen=max_entries)
+        self._file_logger: Optional[logging.Logger] = None
+        self._lock = threading.Lock()
+
+    def _get_file_logger(self) -> logging.Logger:
+        # Opened on first use so importing the app never touches the filesystem
+        with self._lock:
+            if self._file_logger is None:
+                file_logger = logging.getLogger("app.slow_queries")
+                file_logger.propagate = False
+                file_logger.setLevel(logging.INFO)
+                directory = os.path.dirname(settings.SLOW_QUERY_LOG_FILE)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                handler = RotatingFileHandler(
+                    settings.SLOW_QUERY_LOG_FILE,
+                    maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+                    backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+                )
+                file_logger.addHandler(handler)
+                self._file_logger = file_logger
+            return self._file_logger
+
+    def record(self, entry: dict) -> None:
+        self.entries.append(entry)
+        try:
+            self._get_file_logger().info(json.dumps(entry, default=str))
+        except OSError:
+            logger.exception("Could not write the slow query log")
+
+    def recent(self, limit: int = 50) -> list:
+        return list(self.entries)[-limit:][::-1]
+
+slow_query_log = SlowQueryLog()
+
+_EXPLAINABLE = ("select", "with")
+
+def explain_statement(conn, statement: str, parameters) -> Optional[str]:
+    """Plan for a statement that just ran, without executing it again.
+
+    Uses a fresh DBAPI cursor so the caller's result set is untouched, inside a
+    savepoint so a failing EXPLAIN cannot abort the surrounding transaction.
+    """
+    if conn.dialect.name != "postgresql" or not statement.lstrip().lower().startswith(_EXPLAINABLE):
+        return None
+
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"EXPLAIN (ANALYZE off) {statement}", parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        except Exception:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            logger.debug("EXPLAIN failed for slow statement", exc_info=True)
+            plan = None
+        cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        return plan
+    finally:
+        cursor.close()
+
+def _record_slow_query(conn, statement, parameters, executemany, duration) -> None:
+    stats = current_query_stats.get()
+    plan = None
+    if settings.SLOW_QUERY_EXPLAIN and not executemany:
+        try:
+            plan = explain_statement(conn, statement, parameters)
+        except Exception:
+            logger.warning("Could not capture the plan for a slow statement", exc_info=True)
+
+    slow_query_log.record({
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "route": stats.route if stats is not None else None,
+        "duration_ms": round(duration * 1000, 2),
+        "statement": statement,
+        "parameters": repr(parameters)[:2000],
+        "executemany": executemany,
+        "plan": plan,
+    })
+    logger.warning(
+        "Slow query (%.2fms) in %s: %s",
+        duration * 1000, stats.route if stats is not None else "background", statement[:500]
+    )
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+# Registered on the Engine class so the primary, replica and async engines are all covered
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_start_time"].pop()
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, duration)
+
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold and duration * 1000 >= threshold:
+        _record_slow_query(conn, statement, parameters, executemany, duration)
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # Keep the timing stack balanced when a statement fails
+    starts = exception_context.connection.info.get("query_start_time") if exception_context.connection else None
+    if starts:
+        starts.pop()
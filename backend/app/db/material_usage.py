@@ -0,0 +1,121 @@
+"""
+Normalized material usage (one row per production x raw material).
+
+Production.raw_materials_used stays the source of truth; ORM flush hooks
+rewrite a production's usage rows in the same transaction whenever the JSON
+or the start date changes, so consumption can be aggregated in SQL by
+material and date. Rows loaded without the ORM are folded in by
+rebuild_material_usage, which seed_data runs after loading and
+backfill_material_usage.py runs on demand.
+"""
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import delete, event, inspect, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.models.inventory import RawMaterial
+from app.models.production import Production, ProductionMaterialUsage
+
+USAGE_COLUMNS = ("raw_materials_used", "start_date")
+
+_CHANGED_KEY = "material_usage_changed"
+
+QUANTITY_KEYS = ("planned_quantity", "actual_quantity", "unit_cost")
+
+# Rebuild filter: the entry's value under `key` is absent or casts to float
+NUMERIC_ENTRY = "COALESCE(entry->>'{key}' ~ '^\\s*[-+]?([0-9]+\\.?[0-9]*|\\.[0-9]+)([eE][-+]?[0-9]+)?\\s*$', TRUE)"
+
+def _number(value) -> float:
+    return float(value) if value is not None else 0.0
+
+def usage_rows(production: Production) -> list:
+    """Usage rows for a production's raw_materials_used entries
+
+    Entries without an integer material_id or with non-numeric quantities are
+    skipped, as rebuild_material_usage skips them.
+    """
+    rows = []
+    for entry in production.raw_materials_used or []:
+        try:
+            rows.append({
+                "production_id": production.id,
+                "material_id": int(entry["material_id"]),
+                "planned_quantity": _number(entry.get("planned_quantity")),
+                "actual_quantity": _number(entry.get("actual_quantity")),
+                "unit_cost": _number(entry.get("unit_cost")),
+                "production_date": production.start_date,
+            })
+        except (AttributeError, KeyError, TypeError, ValueError):
+            continue
+    return rows
+
+@event.listens_for(Session, "before_flush")
+def _collect_changed_productions(session, flush_context, instances):
+    # Attribute history is read here, before the flush resets it
+    session.info[_CHANGED_KEY] = [
+        obj for obj in session.dirty
+        if isinstance(obj, Production)
+        and any(inspect(obj).attrs[key].history.has_changes() for key in USAGE_COLUMNS)
+    ]
+
+@event.listens_for(Session, "after_flush")
+def _write_usage_rows(session, flush_context):
+    changed = session.info.pop(_CHANGED_KEY, [])
+    created = [obj for obj in session.new if isinstance(obj, Production)]
+    if not changed and not created:
+        return
+
+    conn = session.connection()
+    usage = ProductionMaterialUsage.__table__
+    # Deleted productions take their rows with them (ON DELETE CASCADE)
+    if changed:
+        conn.execute(delete(usage).where(usage.c.production_id.in_([obj.id for obj in changed])))
+    rows = [row for obj in created + changed for row in usage_rows(obj)]
+    if not rows:
+        return
+    # Entries naming a raw material that no longer exists are skipped, as in the rebuild
+    existing = set(conn.execute(
+        select(RawMaterial.id).where(RawMaterial.id.in_({row["material_id"] for row in rows}))
+    ).scalars())
+    rows = [row for row in rows if row["material_id"] in existing]
+    if rows:
+        conn.execute(insert(usage), rows)
+
+def rebuild_material_usage(conn, since: Optional[date] = None) -> int:
+    """Recompute usage rows from productions.raw_materials_used, for productions
+    started on or after `since` (all by default); returns the rows written
+
+    PostgreSQL only. Must run inside a transaction; the EXCLUSIVE lock holds off
+    ORM writers until the rebuilt rows commit. Malformed entries and entries
+    naming a raw material that no longer exists are skipped, as in the hooks.
+    """
+    usage = ProductionMaterialUsage.__tablename__
+    conn.execute(text(f"LOCK TABLE {usage} IN EXCLUSIVE MODE"))
+
+    clear = f"DELETE FROM {usage}"
+    window = ""
+    params = {}
+    if since is not None:
+        clear += " WHERE production_date >= :since"
+        window = "AND p.start_date >= :since"
+        params["since"] = since
+
+    conn.execute(text(clear), params)
+    result = conn.execute(text(f"""
+        INSERT INTO {usage}
+            (production_id, material_id, planned_quantity, actual_quantity, unit_cost, production_date)
+        SELECT p.id, m.id,
+               COALESCE((entry->>'planned_quantity')::float, 0),
+               COALESCE((entry->>'actual_quantity')::float, 0),
+               COALESCE((entry->>'unit_cost')::float, 0),
+               p.start_date
+        FROM {Production.__tablename__} p
+        CROSS JOIN LATERAL json_array_elements(CASE json_typeof(p.raw_materials_used)
+            WHEN 'array' THEN p.raw_materials_used ELSE '[]'::json END) entry
+        JOIN {RawMaterial.__tablename__} m ON m.id = CASE
+            WHEN json_typeof(entry) = 'object' AND entry->>'material_id' ~ '^[0-9]+$'
+            THEN (entry->>'material_id')::int END
+        WHERE {" AND ".join(NUMERIC_ENTRY.format(key=key) for key in QUANTITY_KEYS)} {window}
+    """), params)
+    return result.rowcount
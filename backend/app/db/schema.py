@@ -0,0 +1,26 @@
+import os
+from app.db.database import engine
+
+ALEMBIC_INI = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "alembic.ini"))
+
+def get_head_revisions() -> set:
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_heads())
+
+def get_current_revisions() -> set:
+    from alembic.runtime.migration import MigrationContext
+
+    with engine.connect() as connection:
+        return set(MigrationContext.configure(connection).get_current_heads())
+
+def verify_schema_revision() -> None:
+    """Fail fast when the database is not migrated to the code's Alembic head"""
+    current = get_current_revisions()
+    expected = get_head_revisions()
+    if current != expected:
+        raise RuntimeError(
+            f"Database schema is at revision {sorted(current) or 'none'}, "
+            f"expected {sorted(expected)}. Run 'alembic upgrade head'."
+        )
@@ -0,0 +1,97 @@
+"""
+Per-table version counters for dependency-tracked caches.
+
+Every commit that inserted, updated or deleted ORM objects bumps the version
+of the tables involved. A cached result that recorded the versions of the
+tables it was computed from is still valid while those versions match. The
+versions live in Redis so a write in one worker invalidates every worker's
+cache; without Redis they are per worker. When Redis fails after startup,
+reads skip the cache and missed bumps leave entries to expire with the TTL.
+"""
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.redis_client import connect_redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY = "table_versions"
+
+_TOUCHED_KEY = "touched_tables"
+
+class MemoryTableVersions:
+    def __init__(self):
+        self._versions: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def bump(self, tables: Iterable[str]) -> None:
+        with self._lock:
+            for table in tables:
+                self._versions[table] += 1
+
+    def get(self, tables: Tuple[str, ...]) -> Tuple[int, ...]:
+        return tuple(self._versions[table] for table in tables)
+
+class RedisTableVersions:
+    def __init__(self, client):
+        self.client = client
+
+    def bump(self, tables: Iterable[str]) -> None:
+        from redis import RedisError
+
+        tables = list(tables)
+        pipeline = self.client.pipeline(transaction=False)
+        for table in tables:
+            pipeline.hincrby(REDIS_KEY, table, 1)
+        try:
+            pipeline.execute()
+        except RedisError as exc:
+            # Runs after the commit, so the write stands; cached results expire with the TTL
+            logger.warning("Could not bump table versions for %s (%s)", ", ".join(tables), exc)
+
+    def get(self, tables: Tuple[str, ...]) -> Optional[Tuple[int, ...]]:
+        """Current versions, or None when Redis cannot be read"""
+        from redis import RedisError
+
+        try:
+            versions = self.client.hmget(REDIS_KEY, tables)
+        except RedisError as exc:
+            logger.warning("Could not read table versions (%s); skipping the response cache", exc)
+            return None
+        return tuple(int(version or 0) for version in versions)
+
+_table_versions = None
+_table_versions_lock = threading.Lock()
+
+def get_table_versions():
+    """Redis-backed table versions, or in-memory ones when Redis is unreachable"""
+    global _table_versions
+    if _table_versions is None:
+        with _table_versions_lock:
+            if _table_versions is None:
+                client = connect_redis("cached responses are only invalidated by writes in the same worker")
+                _table_versions = RedisTableVersions(client) if client else MemoryTableVersions()
+    return _table_versions
+
+@event.listens_for(Session, "after_flush")
+def _record_touched_tables(session, flush_context):
+    touched = session.info.setdefault(_TOUCHED_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table is not None:
+            touched.add(table)
+
+@event.listens_for(Session, "after_commit")
+def _bump_touched_tables(session):
+    touched = session.info.pop(_TOUCHED_KEY, None)
+    if touched:
+        get_table_versions().bump(sorted(touched))
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_touched_tables(session, previous_transaction):
+    session.info.pop(_TOUCHED_KEY, None)
@@ -0,0 +1,130 @@
+"""
+Monthly waste rollup (month x reason x item type).
+
+Kept current by ORM flush hooks on WasteRecord, in the same way and the same
+transaction as the dashboard counters (app.db.counters). Rows loaded without
+the ORM are folded in by rebuild_waste_rollup, which seed_data runs after
+loading and backfill_waste_rollup.py runs on demand.
+"""
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import delete, event, func, insert, inspect, literal_column, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.counters import committed_values, track_old_values
+from app.models.waste import WasteMonthlyRollup, WasteRecord
+
+ROLLUP_COLUMNS = ("date", "waste_reason", "item_type", "waste_value", "waste_quantity")
+
+_DELTAS_KEY = "waste_rollup_deltas"
+
+def month_start(value) -> Optional[datetime]:
+    if value is None:
+        return None
+    return datetime(value.year, value.month, 1)
+
+def _add(deltas: dict, values: dict, sign: int) -> None:
+    month = month_start(values["date"])
+    if month is None or values["waste_reason"] is None:
+        return
+    totals = deltas[(month, values["waste_reason"], values["item_type"])]
+    totals[0] += sign * (values["waste_value"] or 0)
+    totals[1] += sign * (values["waste_quantity"] or 0)
+    totals[2] += sign
+
+def _rollup_changed(obj) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[key].history.has_changes() for key in ROLLUP_COLUMNS)
+
+@event.listens_for(Session, "before_flush")
+def _collect_old_rows(session, flush_context, instances):
+    deltas = defaultdict(lambda: [0.0, 0.0, 0])
+    changed = []
+    for obj in session.dirty:
+        if isinstance(obj, WasteRecord) and _rollup_changed(obj):
+            _add(deltas, committed_values(obj, ROLLUP_COLUMNS), -1)
+            changed.append(obj)
+    for obj in session.deleted:
+        if isinstance(obj, WasteRecord):
+            _add(deltas, committed_values(obj, ROLLUP_COLUMNS), -1)
+    session.info[_DELTAS_KEY] = (deltas, changed)
+
+@event.listens_for(Session, "after_flush")
+def _apply_rollup_deltas(session, flush_context):
+    deltas, changed = session.info.pop(_DELTAS_KEY, (defaultdict(lambda: [0.0, 0.0, 0]), []))
+    for obj in list(session.new) + changed:
+        if isinstance(obj, WasteRecord):
+            _add(deltas, {key: getattr(obj, key) for key in ROLLUP_COLUMNS}, 1)
+
+    # Fixed key order, so transactions upserting the same rollup rows lock them
+    # in the same order instead of deadlocking
+    rows = [
+        {
+            "month": month, "waste_reason": reason, "item_type": item_type,
+            "total_value": value, "total_quantity": quantity, "record_count": count,
+        }
+        for (month, reason, item_type), (value, quantity, count) in sorted(deltas.items())
+        if value or quantity or count
+    ]
+    if not rows:
+        return
+    table = WasteMonthlyRollup.__table__
+    statement = pg_insert(table)
+    session.connection().execute(
+        statement.on_conflict_do_update(
+            index_elements=["month", "waste_reason", "item_type"],
+            set_={
+                "total_value": table.c.total_value + statement.excluded.total_value,
+                "total_quantity": table.c.total_quantity + statement.excluded.total_quantity,
+                "record_count": table.c.record_count + statement.excluded.record_count,
+                "updated_at": func.now(),
+            },
+        ),
+        rows,
+    )
+    # A group whose last record was deleted or moved disappears, as it would
+    # from a GROUP BY over waste_records
+    emptied = [(row["month"], row["waste_reason"], row["item_type"]) for row in rows if row["record_count"] < 0]
+    if emptied:
+        session.connection().execute(delete(table).where(
+            tuple_(table.c.month, table.c.waste_reason, table.c.item_type).in_(emptied),
+            table.c.record_count <= 0,
+        ))
+
+track_old_values(WasteRecord, ROLLUP_COLUMNS)
+
+def rebuild_waste_rollup(conn, since: Optional[date] = None) -> int:
+    """Recompute the rollup from waste_records, for months from `since` on (all
+    months by default); returns the number of rollup rows written
+
+    Must run inside a transaction. The EXCLUSIVE lock holds off ORM writers
+    until the rebuilt rows commit, so no delta is lost in between.
+    """
+    rollup = WasteMonthlyRollup.__table__
+    conn.execute(text(f"LOCK TABLE {WasteMonthlyRollup.__tablename__} IN EXCLUSIVE MODE"))
+
+    # Literal unit so SELECT and GROUP BY render the same expression
+    month = func.date_trunc(literal_column("'month'"), WasteRecord.date)
+    source = select(
+        month.label("month"),
+        WasteRecord.waste_reason,
+        WasteRecord.item_type,
+        func.sum(WasteRecord.waste_value),
+        func.sum(WasteRecord.waste_quantity),
+        func.count(),
+    ).where(WasteRecord.date.is_not(None)).group_by(month, WasteRecord.waste_reason, WasteRecord.item_type)
+
+    clear = delete(rollup)
+    if since is not None:
+        first_month = month_start(since)
+        source = source.where(WasteRecord.date >= first_month)
+        clear = clear.where(rollup.c.month >= first_month)
+
+    conn.execute(clear)
+    result = conn.execute(insert(rollup).from_select(
+        ["month", "waste_reason", "item_type", "total_value", "total_quantity", "record_count"], source
+    ))
+    return result.rowcount
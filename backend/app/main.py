@@ -1,33 +1,51 @@
+import time
+_boot_started = time.perf_counter()
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.core.config import settings
+from app.core.cache import render_cache_metrics
+from app.core.metrics import render_prometheus
+from app.core.response_cache import response_cache
+from app.core.security import collect_password_hash_metrics, verified_token_cache
+from app.core.middleware import MetricsMiddleware, QueryStatsMiddleware
 from app.api.v1 import auth, inventory, analytics, hrm, crm, reports
-from app.api.v1 import factory_analytics, inventory_advanced
-from app.db.database import engine
-from app.models import (
-    user, inventory as inv_models, supplier, purchase, production, 
-    sales, finance, quality, waste, alerts, employee, crm as crm_models, invoice
-)
+from app.api.v1 import factory_analytics, inventory_advanced, admin
+from app.crud.user import principal_cache
+from app.db import base  # noqa: F401 - registers every model with the mapper
+from app.db.counters import reconcile_periodically
+from app.db.database import collect_pool_metrics
+from app.db.schema import verify_schema_revision
 
-# Create tables
-user.Base.metadata.create_all(bind=engine)
-inv_models.Base.metadata.create_all(bind=engine)
-supplier.Base.metadata.create_all(bind=engine)
-purchase.Base.metadata.create_all(bind=engine)
-production.Base.metadata.create_all(bind=engine)
-sales.Base.metadata.create_all(bind=engine)
-finance.Base.metadata.create_all(bind=engine)
-quality.Base.metadata.create_all(bind=engine)
-waste.Base.metadata.create_all(bind=engine)
-alerts.Base.metadata.create_all(bind=engine)
-employee.Base.metadata.create_all(bind=engine)
-crm_models.Base.metadata.create_all(bind=engine)
-invoice.Base.metadata.create_all(bind=engine)
+logger = logging.getLogger(__name__)
+
+# Schema is managed by Alembic (see alembic/versions); run 'alembic upgrade head'
+# once per deploy instead of creating tables from every worker.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.VERIFY_SCHEMA_ON_STARTUP:
+        await run_in_threadpool(verify_schema_revision)
+    app.state.boot_seconds = time.perf_counter() - _boot_started
+    logger.info("Worker booted in %.3fs", app.state.boot_seconds)
+    
+    # Corrects dashboard counter drift from writes that bypass the ORM
+    reconciler = None
+    if settings.DASHBOARD_RECONCILE_INTERVAL_SECONDS > 0:
+        reconciler = asyncio.create_task(reconcile_periodically(settings.DASHBOARD_RECONCILE_INTERVAL_SECONDS))
+    yield
+    if reconciler is not None:
+        reconciler.cancel()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -39,6 +57,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request SQL statement counts and N+1 detection
+app.add_middleware(QueryStatsMiddleware)
+
+# Per-route request metrics, exposed at /metrics (outermost, sets the route template)
+app.add_middleware(MetricsMiddleware, router=app.router)
+
 # Include routers
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
 app.include_router(inventory.router, prefix=f"{settings.API_V1_STR}/inventory", tags=["inventory"])
@@ -48,6 +72,7 @@ app.include_router(analytics.router, prefix=f"{settings.API_V1_STR}/analytics",
 app.include_router(hrm.router, prefix=f"{settings.API_V1_STR}/hrm", tags=["hrm"])
 app.include_router(crm.router, prefix=f"{settings.API_V1_STR}/crm", tags=["crm"])
 app.include_router(reports.router, prefix=f"{settings.API_V1_STR}/reports", tags=["reports"])
+app.include_router(admin.router, prefix=f"{settings.API_V1_STR}/admin", tags=["admin"])
 
 @app.get("/")
 def read_root():
@@ -55,7 +80,28 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy", "version": settings.VERSION}
+    return {
+        "status": "healthy",
+        "version": settings.VERSION,
+        "boot_seconds": getattr(app.state, "boot_seconds", None)
+    }
+
+def collect_app_metrics(lines: list) -> None:
+    lines.append("# TYPE app_boot_seconds gauge")
+    lines.append(f"app_boot_seconds {getattr(app.state, 'boot_seconds', 0) or 0}")
+    render_cache_metrics(lines, {
+        "principal": principal_cache,
+        "verified_token": verified_token_cache,
+        "dashboard": analytics.dashboard_snapshot,
+        "response": response_cache,
+    })
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(
+        render_prometheus([collect_pool_metrics, collect_password_hash_metrics, collect_app_metrics]),
+        media_type="text/plain; version=0.0.4"
+    )
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, Float, DateTime, JSON
+from app.db.database import Base
+
+class AnalyticsSnapshot(Base):
+    """Latest precomputed result of a heavy analytics endpoint (app.core.precompute)"""
+    __tablename__ = "analytics_snapshots"
+
+    name = Column(String, primary_key=True)
+    payload = Column(JSON, nullable=False)
+    computed_at = Column(DateTime, nullable=False)
+    duration_ms = Column(Float, nullable=False)
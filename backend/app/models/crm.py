@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, Enum, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, Enum, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -24,6 +24,9 @@ class LeadSource(str, enum.Enum):
 
 class Lead(Base):
     __tablename__ = "leads"
+    __table_args__ = (
+        Index("ix_leads_status", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     company_name = Column(String, nullable=False)
@@ -48,6 +51,10 @@ class Lead(Base):
 
 class Activity(Base):
     __tablename__ = "activities"
+    __table_args__ = (
+        Index("ix_activities_lead_id_date", "lead_id", "date"),
+        Index("ix_activities_date", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     lead_id = Column(Integer, ForeignKey("leads.id"))
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, Float, DateTime
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class DashboardCounter(Base):
+    """Running dashboard total, kept current by app.db.counters"""
+    __tablename__ = "dashboard_counters"
+
+    name = Column(String, primary_key=True)
+    value = Column(Float, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
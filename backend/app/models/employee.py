@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, Enum, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, Enum, ForeignKey, Date, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -53,6 +53,10 @@ class Employee(Base):
 
 class Attendance(Base):
     __tablename__ = "attendances"
+    __table_args__ = (
+        Index("ix_attendances_employee_id_date", "employee_id", "date"),
+        Index("ix_attendances_date_status", "date", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("employees.id"))
@@ -69,6 +73,9 @@ class Attendance(Base):
 
 class Leave(Base):
     __tablename__ = "leaves"
+    __table_args__ = (
+        Index("ix_leaves_status_employee_id", "status", "employee_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("employees.id"))
@@ -86,6 +93,9 @@ class Leave(Base):
 
 class Payroll(Base):
     __tablename__ = "payrolls"
+    __table_args__ = (
+        Index("ix_payrolls_year_month", "year", "month"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("employees.id"))
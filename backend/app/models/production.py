@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, Enum, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, Enum, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -12,6 +12,9 @@ class ProductionStatus(str, enum.Enum):
 
 class Production(Base):
     __tablename__ = "productions"
+    __table_args__ = (
+        Index("ix_productions_status_start_date", "status", "start_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     production_number = Column(String, unique=True, nullable=False)
@@ -35,4 +38,23 @@ class Production(Base):
     created_by = Column(Integer, ForeignKey("users.id"))
     
     product = relationship("FinishedProduct")
-    creator = relationship("User")
\ No newline at end of file
+    creator = relationship("User")
+
+class ProductionMaterialUsage(Base):
+    """Raw material consumed by a production, kept in step with raw_materials_used by app.db.material_usage"""
+    __tablename__ = "production_material_usage"
+    __table_args__ = (
+        Index("ix_production_material_usage_material_date", "material_id", "production_date"),
+        Index("ix_production_material_usage_production_id", "production_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    production_id = Column(Integer, ForeignKey("productions.id", ondelete="CASCADE"), nullable=False)
+    material_id = Column(Integer, ForeignKey("raw_materials.id"), nullable=False)
+    planned_quantity = Column(Float, nullable=False, default=0)
+    actual_quantity = Column(Float, nullable=False, default=0)
+    unit_cost = Column(Float, nullable=False, default=0)
+    production_date = Column(DateTime)  # the production's start_date
+
+    production = relationship("Production")
+    material = relationship("RawMaterial")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, Enum, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, Enum, ForeignKey, JSON, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -45,6 +45,14 @@ class Customer(Base):
 # Sales Order model
 class SalesOrder(Base):
     __tablename__ = "sales_orders"
+    __table_args__ = (
+        Index("ix_sales_orders_order_date", "order_date"),
+        # Serves the open-order recount in app.db.counters.reconcile_counters
+        Index(
+            "ix_sales_orders_open_status", "status",
+            postgresql_where=text("status IN ('PENDING', 'CONFIRMED')"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     order_number = Column(String, unique=True, nullable=False)
@@ -57,7 +65,7 @@ class SalesOrder(Base):
     discount_amount = Column(Float, default=0)
     tax_amount = Column(Float, default=0)
     total_amount = Column(Float, nullable=False)
-    payment_status = Column(Enum(PaymentStatus), default=PaymentStatus.PENDING)  # ✅ Now defined
+    payment_status = Column(Enum(PaymentStatus, name="salespaymentstatus"), default=PaymentStatus.PENDING)  # ✅ Now defined
     sales_person = Column(String)
     notes = Column(Text)
     created_at = Column(DateTime, server_default=func.now())
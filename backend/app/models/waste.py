@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -14,6 +14,12 @@ class WasteReason(str, enum.Enum):
 
 class WasteRecord(Base):
     __tablename__ = "waste_records"
+    __table_args__ = (
+        Index("ix_waste_records_date", "date"),
+        Index("ix_waste_records_reason_date", "waste_reason", "date"),
+    )
+    # Fetch server defaults (date) on INSERT so the rollup hooks see them
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     waste_number = Column(String, unique=True, nullable=False)
@@ -34,4 +40,16 @@ class WasteRecord(Base):
     created_by = Column(Integer, ForeignKey("users.id"))
     
     approver = relationship("User", foreign_keys=[approved_by])
-    creator = relationship("User", foreign_keys=[created_by])
\ No newline at end of file
+    creator = relationship("User", foreign_keys=[created_by])
+
+class WasteMonthlyRollup(Base):
+    """Waste totals per month, reason and item type, kept current by app.db.waste_rollup"""
+    __tablename__ = "waste_monthly_rollup"
+
+    month = Column(DateTime, primary_key=True)  # first day of the month, midnight
+    waste_reason = Column(Enum(WasteReason), primary_key=True)
+    item_type = Column(String, primary_key=True)
+    total_value = Column(Float, nullable=False, default=0)
+    total_quantity = Column(Float, nullable=False, default=0)
+    record_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
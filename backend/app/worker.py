@@ -0,0 +1,40 @@
+"""
+Celery worker for background precomputation.
+
+    celery -A app.worker worker --beat --loglevel=info
+
+Beat refreshes every snapshot registered with @precomputed every
+PRECOMPUTE_INTERVAL_SECONDS; endpoints and the admin API queue on-demand
+refreshes through refresh_snapshot_task.
+"""
+from celery import Celery
+
+from app.core.config import settings
+from app.core.precompute import clear_refresh_marker, refresh_snapshot, registry
+from app.db import base  # noqa: F401 - registers every model with the mapper
+from app.api.v1 import factory_analytics, inventory_advanced  # noqa: F401 - register the precomputed analytics
+
+celery_app = Celery("nutra_pharma_erp", broker=settings.REDIS_URL)
+celery_app.conf.update(
+    task_ignore_result=True,
+    # Fail fast when publishing from a request while the broker is down
+    broker_connection_timeout=1,
+    broker_transport_options={"socket_timeout": 1, "socket_connect_timeout": 1},
+    beat_schedule={
+        f"precompute-{name}": {
+            "task": "app.worker.refresh_snapshot",
+            "schedule": settings.PRECOMPUTE_INTERVAL_SECONDS,
+            "args": (name,),
+            # A refresh still queued when the next one is due is dropped
+            "options": {"expires": settings.PRECOMPUTE_INTERVAL_SECONDS},
+        }
+        for name in registry
+    },
+)
+
+@celery_app.task(name="app.worker.refresh_snapshot")
+def refresh_snapshot_task(name: str) -> None:
+    try:
+        refresh_snapshot(name)
+    finally:
+        clear_refresh_marker(name)
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Rebuild production material usage rows from productions.raw_materials_used.
+
+Needed after productions were written without the ORM (bulk loads, raw SQL,
+restores). Rebuilds every production, or only those started from --since on:
+
+    python backfill_material_usage.py --since 2026-01-01
+"""
+import argparse
+import sys
+import time
+from datetime import date
+
+from app.db import base  # noqa: F401 - registers every model with the metadata
+from app.db.database import engine
+from app.db.material_usage import rebuild_material_usage
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--since", type=date.fromisoformat, help="first production start date to rebuild (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        rows = rebuild_material_usage(conn, since=args.since)
+    scope = f"from {args.since}" if args.since else "for all productions"
+    print(f"Rebuilt {rows:,} material usage rows {scope} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
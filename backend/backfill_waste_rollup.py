@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Rebuild the monthly waste rollup from waste_records.
+
+Needed after waste rows were written without the ORM (bulk loads, raw SQL,
+restores). Rebuilds every month, or only months from --since on:
+
+    python backfill_waste_rollup.py --since 2026-01-01
+"""
+import argparse
+import sys
+import time
+from datetime import date
+
+from app.db import base  # noqa: F401 - registers every model with the metadata
+from app.db.database import engine
+from app.db.waste_rollup import rebuild_waste_rollup
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--since", type=date.fromisoformat, help="first month to rebuild (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        rows = rebuild_waste_rollup(conn, since=args.since)
+    scope = f"from {args.since:%Y-%m}" if args.since else "for all months"
+    print(f"Rebuilt {rows:,} rollup rows {scope} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""
+Deterministic benchmark dataset.
+
+Loads the seed_data generator with smaller per-table volumes, so scale 1
+here is a quick, laptop-sized dataset; pass larger scales to approach
+production volumes.
+"""
+from seed_data import seed_database
+
+BENCHMARK_USERNAME = "bench-admin"
+BENCHMARK_PASSWORD = "bench-admin-password"
+
+# Rows per table at benchmark scale factor 1
+BASE_ROWS = {
+    "suppliers": 20,
+    "raw_materials": 500,
+    "finished_products": 200,
+    "productions": 1_000,
+    "waste_records": 5_000,
+    "customers": 200,
+    "sales_orders": 2_000,
+    "invoices": 1_000,
+    "employees": 100,
+    "attendance_days": 30,
+    "leads": 500,
+    "activities": 1_500,
+}
+
+def seed(engine, scale: float = 1, seed: int = 42) -> dict:
+    """Replace all data with the benchmark dataset; returns rows per table"""
+    return seed_database(
+        engine,
+        scale=scale,
+        seed=seed,
+        base_rows=BASE_ROWS,
+        admin_username=BENCHMARK_USERNAME,
+        admin_password=BENCHMARK_PASSWORD,
+    )
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for worker startup.
+
+Runs `python -X importtime -c "import app.main"` in a fresh interpreter and
+fails when the cumulative import time exceeds the budget, or when a module
+that should only load on first use (pandas, reportlab, ...) is imported.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# Heavy libraries that must only be imported by the endpoints that use them
+LAZY_MODULES = ("pandas", "numpy", "reportlab", "openpyxl", "celery")
+
+DEFAULT_BUDGET_MS = 2500
+DEFAULT_RUNS = 3
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def measure_import(module: str) -> dict:
+    """Return {module_name: cumulative_us} for one cold import of `module`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            timings[name.strip()] = int(cumulative.strip())
+    return timings
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    args = parser.parse_args()
+
+    runs = [measure_import(args.module) for _ in range(args.runs)]
+    # Best of N to filter out noise from a cold disk cache
+    best_ms = min(run[args.module] for run in runs) / 1000
+
+    failures = []
+    eager = sorted(
+        name for name in runs[0]
+        if name.split(".")[0] in LAZY_MODULES and "." not in name
+    )
+    if eager:
+        failures.append(f"lazily loaded modules imported at startup: {', '.join(eager)}")
+    if best_ms > args.budget_ms:
+        failures.append(f"import time {best_ms:.0f}ms exceeds budget {args.budget_ms:.0f}ms")
+
+    print(f"import {args.module}: {best_ms:.0f}ms (budget {args.budget_ms:.0f}ms, best of {args.runs})")
+    slowest = sorted(
+        ((name, us) for name, us in runs[0].items() if name.count(".") <= 1 and name != args.module),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:10]
+    for name, us in slowest:
+        print(f"  {us / 1000:8.1f}ms  {name}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
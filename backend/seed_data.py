@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Synthetic data generator for production-like volumes.
+
+Seeds every model at a configurable scale factor, deterministically from a
+seed. At scale 1 that is 10k SKUs, 1M waste records and 5M attendance rows
+(about 8M rows in total). Rows are streamed with PostgreSQL COPY in chunks,
+so memory stays flat and a 10M row dataset loads in a few minutes; other
+databases fall back to batched executemany inserts.
+
+    python seed_data.py --scale 0.1 --reset
+"""
+import argparse
+import csv
+import io
+import json
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from enum import Enum
+from sqlalchemy import insert, text
+from app.core.security import get_password_hash
+from app.db import base  # noqa: F401 - registers every model with the metadata
+from app.db.counters import reconcile_counters
+from app.db.material_usage import rebuild_material_usage
+from app.db.waste_rollup import rebuild_waste_rollup
+from app.db.database import Base, engine
+from app.models.crm import LeadSource, LeadStatus
+from app.models.employee import Department, EmployeeStatus
+from app.models.inventory import QualityGrade, StockStatus
+from app.models.invoice import InvoiceStatus, PaymentTerms
+from app.models.production import ProductionStatus
+from app.models.sales import PaymentStatus, SalesOrderStatus
+from app.models.user import UserRole
+from app.models.waste import WasteReason
+
+# Rows per table at scale factor 1
+BASE_ROWS = {
+    "suppliers": 500,
+    "raw_materials": 5_000,
+    "finished_products": 10_000,
+    "productions": 200_000,
+    "waste_records": 1_000_000,
+    "customers": 5_000,
+    "sales_orders": 500_000,
+    "invoices": 300_000,
+    "employees": 2_000,
+    "attendance_days": 2_500,  # attendance rows = employees x days
+    "leads": 50_000,
+    "activities": 200_000,
+}
+
+CHUNK_ROWS = 50_000
+
+DEFAULT_ADMIN_USERNAME = "admin"
+DEFAULT_ADMIN_PASSWORD = "admin123"
+
+def _cell(value):
+    if isinstance(value, Enum):
+        return value.name  # SQLAlchemy Enum columns store member names
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+def with_column_defaults(table: str, columns: tuple, rows):
+    """Append the model's scalar Python defaults for omitted columns.
+
+    COPY only applies server defaults, so without this `default=0` columns
+    would be loaded as NULL, which the ORM never writes.
+    """
+    defaults = [
+        (column.name, column.default.arg)
+        for column in Base.metadata.tables[table].columns
+        if column.name not in columns and column.default is not None and column.default.is_scalar
+    ]
+    if not defaults:
+        return columns, rows
+    names, values = zip(*defaults)
+    return columns + names, (tuple(row) + values for row in rows)
+
+def copy_rows(conn, table: str, columns: tuple, rows) -> int:
+    """Stream rows (tuples in `columns` order) into `table`; returns the row count"""
+    columns, rows = with_column_defaults(table, columns, rows)
+    if conn.dialect.name != "postgresql":
+        return _insert_rows(conn, table, columns, rows)
+
+    cursor = conn.connection.dbapi_connection.cursor()
+    statement = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    total = 0
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_cell(value) for value in row])
+        total += 1
+        if total % CHUNK_ROWS == 0:
+            buffer.seek(0)
+            cursor.copy_expert(statement, buffer)
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        buffer.seek(0)
+        cursor.copy_expert(statement, buffer)
+    return total
+
+def _insert_rows(conn, table: str, columns: tuple, rows) -> int:
+    statement = insert(Base.metadata.tables[table])
+    total = 0
+    batch = []
+    for row in rows:
+        batch.append(dict(zip(columns, row)))
+        if len(batch) == CHUNK_ROWS:
+            conn.execute(statement, batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        conn.execute(statement, batch)
+        total += len(batch)
+    return total
+
+def reset_tables(conn) -> None:
+    tables = [table.name for table in Base.metadata.sorted_tables]
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY CASCADE"))
+    else:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+
+def reset_sequences(conn) -> None:
+    # Explicit ids were loaded, so move each serial past the highest one
+    if conn.dialect.name != "postgresql":
+        return
+    for table in Base.metadata.sorted_tables:
+        if "id" in table.columns:
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table.name}), 0) + 1, false)"
+            ))
+
+def has_data(conn) -> bool:
+    return any(
+        conn.execute(text(f"SELECT 1 FROM {table} LIMIT 1")).first()
+        for table in ("users", "raw_materials", "waste_records", "employees")
+    )
+
+def seed_database(
+    bind,
+    scale: float = 1,
+    seed: int = 42,
+    base_rows: dict = BASE_ROWS,
+    admin_username: str = DEFAULT_ADMIN_USERNAME,
+    admin_password: str = DEFAULT_ADMIN_PASSWORD,
+    log=None,
+) -> dict:
+    """Replace all data with a deterministic dataset; returns rows loaded per table"""
+    rng = random.Random(seed)
+    n = {name: max(1, int(rows * scale)) for name, rows in base_rows.items()}
+    today = datetime.combine(date.today(), datetime.min.time())
+    loaded = {}
+
+    def recent(days: int = 365) -> datetime:
+        return today - timedelta(days=rng.randint(0, days), minutes=rng.randint(0, 1439))
+
+    def load(table: str, columns: tuple, rows) -> None:
+        start = time.perf_counter()
+        loaded[table] = copy_rows(conn, table, columns, rows)
+        if log:
+            log(f"  {table:20s} {loaded[table]:>12,} rows  {time.perf_counter() - start:6.1f}s")
+
+    material_costs = [round(rng.uniform(10, 500), 2) for _ in range(n["raw_materials"])]
+
+    def raw_materials():
+        for i in range(1, n["raw_materials"] + 1):
+            quantity = round(rng.uniform(0, 1_000), 2)
+            yield (
+                i, f"Material {i}", rng.randint(1, n["suppliers"]), quantity, rng.choice(("kg", "g", "l")),
+                material_costs[i - 1], 100, 1_000, today + timedelta(days=rng.randint(-30, 720)),
+                f"RM-{i:07d}", StockStatus.LOW_STOCK if quantity < 100 else StockStatus.IN_STOCK,
+                f"Warehouse {rng.randint(1, 5)}", round(rng.uniform(0, 20), 2),
+                rng.choice(tuple(QualityGrade)), 1,
+            )
+
+    def finished_products():
+        for i in range(1, n["finished_products"] + 1):
+            cost_price = round(rng.uniform(50, 2_000), 2)
+            yield (
+                i, f"Product {i}", f"SKU-{i:07d}", round(rng.uniform(0, 5_000), 2), "box", cost_price,
+                round(cost_price * rng.uniform(1.05, 1.8), 2),
+                rng.choice(("tablets", "syrups", "capsules", "supplements")),
+                today + timedelta(days=rng.randint(30, 720)), f"FP-{i:07d}", StockStatus.IN_STOCK,
+                f"Warehouse {rng.randint(1, 5)}", cost_price, round(rng.uniform(100, 5_000), 2),
+                round(rng.uniform(0, 5_000), 2), round(rng.uniform(0, 200), 2), 1,
+            )
+
+    def productions():
+        material_ids = range(1, n["raw_materials"] + 1)
+        for i in range(1, n["productions"] + 1):
+            used = [
+                {
+                    "material_id": material_id,
+                    "planned_quantity": 100,
+                    "actual_quantity": round(rng.uniform(80, 120), 2),
+                    "unit_cost": material_costs[material_id - 1],
+                }
+                for material_id in rng.sample(material_ids, min(3, n["raw_materials"]))
+            ]
+            planned = round(rng.uniform(500, 5_000), 2)
+            start = recent()
+            yield (
+                i, f"PRD-{i:08d}", rng.randint(1, n["finished_products"]), f"B-{i:08d}", planned,
+                round(planned * rng.uniform(0.85, 1.0), 2), start, start + timedelta(hours=rng.randint(4, 72)),
+                rng.choice(tuple(ProductionStatus)), used, round(rng.uniform(1_000, 20_000), 2),
+                round(rng.uniform(500, 10_000), 2), round(rng.uniform(10_000, 100_000), 2),
+                round(rng.uniform(85, 100), 2), f"Supervisor {rng.randint(1, 10)}", 1,
+            )
+
+    def waste_records():
+        reasons = tuple(WasteReason)
+        for i in range(1, n["waste_records"] + 1):
+            item_id = rng.randint(1, n["raw_materials"])
+            yield (
+                i, f"W-{i:09d}", item_id, f"Material {item_id}", "raw-material",
+                round(rng.uniform(1, 50), 2), rng.choice(reasons), round(rng.uniform(10, 5_000), 2),
+                recent(), "seed", rng.random() < 0.7, 1,
+            )
+
+    def sales_orders():
+        statuses, payment_statuses = tuple(SalesOrderStatus), tuple(PaymentStatus)
+        for i in range(1, n["sales_orders"] + 1):
+            subtotal = round(rng.uniform(1_000, 500_000), 2)
+            items = [{"product_id": rng.randint(1, n["finished_products"]), "quantity": rng.randint(1, 100)}]
+            yield (
+                i, f"SO-{i:08d}", rng.randint(1, n["customers"]), recent(), rng.choice(statuses), items,
+                subtotal, round(subtotal * 0.18, 2), round(subtotal * 1.18, 2), rng.choice(payment_statuses), 1,
+            )
+
+    paid_invoices = []
+
+    def invoices():
+        for i in range(1, n["invoices"] + 1):
+            subtotal = round(rng.uniform(1_000, 500_000), 2)
+            total = round(subtotal * 1.18, 2)
+            paid = total if rng.random() < 0.6 else 0
+            issued = recent()
+            customer_id = rng.randint(1, n["customers"])
+            if paid:
+                paid_invoices.append((i, customer_id, paid, issued))
+                status = InvoiceStatus.PAID
+            else:
+                status = rng.choice((InvoiceStatus.SENT, InvoiceStatus.OVERDUE))
+            items = [{"description": "Product", "quantity": 1, "unit_price": subtotal, "total": subtotal}]
+            yield (
+                i, f"INV-{i:08d}", customer_id, rng.randint(1, n["sales_orders"]), issued,
+                issued + timedelta(days=30), PaymentTerms.NET_30, status, items, subtotal,
+                round(subtotal * 0.18, 2), total, paid, round(total - paid, 2), 1,
+            )
+
+    def payments():
+        for i, (invoice_id, customer_id, amount, issued) in enumerate(paid_invoices, start=1):
+            yield (
+                i, f"PAY-{i:08d}", invoice_id, customer_id, amount,
+                issued + timedelta(days=rng.randint(0, 30)), rng.choice(("cash", "bank", "cheque", "online")), 1,
+            )
+
+    def employees():
+        departments = tuple(Department)
+        for i in range(1, n["employees"] + 1):
+            yield (
+                i, f"EMP-{i:06d}", f"First{i}", f"Last{i}", f"employee{i}@example.com", f"42101-{i:07d}-1",
+                rng.choice(departments), "Staff", date(2015, 1, 1) + timedelta(days=rng.randint(0, 3_000)),
+                round(rng.uniform(40_000, 300_000), 2), EmployeeStatus.ACTIVE,
+            )
+
+    def attendances():
+        row_id = 0
+        statuses = ("present", "present", "present", "late", "absent")
+        for day in range(n["attendance_days"]):
+            attendance_date = date.today() - timedelta(days=day)
+            day_start = datetime.combine(attendance_date, datetime.min.time())
+            for employee_id in range(1, n["employees"] + 1):
+                row_id += 1
+                check_in = day_start + timedelta(minutes=540 + rng.randint(-15, 45))
+                yield (
+                    row_id, employee_id, attendance_date, check_in,
+                    check_in + timedelta(minutes=rng.randint(420, 600)),
+                    round(max(0.0, rng.uniform(-2, 2)), 2), rng.choice(statuses),
+                )
+
+    def leads():
+        sources, statuses = tuple(LeadSource), tuple(LeadStatus)
+        for i in range(1, n["leads"] + 1):
+            yield (
+                i, f"Prospect {i}", f"Contact {i}", f"lead{i}@example.com", rng.choice(sources),
+                rng.choice(statuses), round(rng.uniform(10_000, 1_000_000), 2), rng.randint(0, 100),
+                rng.randint(1, n["employees"]),
+            )
+
+    def activities():
+        for i in range(1, n["activities"] + 1):
+            yield (
+                i, rng.randint(1, n["leads"]), rng.choice(("call", "email", "meeting", "note")),
+                f"Follow up {i}", recent(90), rng.randint(5, 90), rng.randint(1, n["employees"]),
+            )
+
+    with bind.begin() as conn:
+        reset_tables(conn)
+
+        load("users", ("id", "email", "username", "full_name", "hashed_password", "role", "is_active", "is_verified"), [
+            (1, f"{admin_username}@nutrapharma.com", admin_username, "System Administrator",
+             get_password_hash(admin_password), UserRole.ADMIN, True, True),
+        ])
+        load("suppliers", ("id", "name", "city", "rating", "is_active"), (
+            (i, f"Supplier {i}", rng.choice(("Karachi", "Lahore", "Faisalabad")), round(rng.uniform(1, 5), 1), True)
+            for i in range(1, n["suppliers"] + 1)
+        ))
+        load("raw_materials", (
+            "id", "name", "supplier_id", "quantity", "unit", "cost_per_unit", "reorder_level", "max_stock_level",
+            "expiry_date", "batch_number", "status", "location", "wastage", "quality_grade", "created_by",
+        ), raw_materials())
+        load("finished_products", (
+            "id", "name", "sku", "quantity", "unit", "cost_price", "selling_price", "category", "expiry_date",
+            "batch_number", "status", "location", "production_cost", "demand_forecast", "actual_sales",
+            "overproduction", "created_by",
+        ), finished_products())
+        load("productions", (
+            "id", "production_number", "product_id", "batch_number", "planned_quantity", "actual_quantity",
+            "start_date", "end_date", "status", "raw_materials_used", "labor_cost", "overhead_cost", "total_cost",
+            "yield_percentage", "supervisor", "created_by",
+        ), productions())
+        load("waste_records", (
+            "id", "waste_number", "item_id", "item_name", "item_type", "waste_quantity", "waste_reason",
+            "waste_value", "date", "reported_by", "approved", "created_by",
+        ), waste_records())
+        load("customers", ("id", "name", "city", "address", "customer_type", "credit_limit", "is_active"), (
+            (i, f"Customer {i}", rng.choice(("Karachi", "Lahore", "Islamabad")), f"{i} Main Road",
+             rng.choice(("pharmacy", "hospital", "distributor", "retailer")), 1_000_000, True)
+            for i in range(1, n["customers"] + 1)
+        ))
+        load("sales_orders", (
+            "id", "order_number", "customer_id", "order_date", "status", "items", "subtotal", "tax_amount",
+            "total_amount", "payment_status", "created_by",
+        ), sales_orders())
+        load("invoices", (
+            "id", "invoice_number", "customer_id", "sales_order_id", "issue_date", "due_date", "payment_terms",
+            "status", "items", "subtotal", "tax_amount", "total_amount", "paid_amount", "balance_due", "created_by",
+        ), invoices())
+        load("payments", (
+            "id", "payment_number", "invoice_id", "customer_id", "amount", "payment_date", "payment_method",
+            "created_by",
+        ), payments())
+        load("employees", (
+            "id", "employee_id", "first_name", "last_name", "email", "cnic", "department", "designation",
+            "hire_date", "salary", "status",
+        ), employees())
+        load("attendances", (
+            "id", "employee_id", "date", "check_in", "check_out", "overtime_hours", "status",
+        ), attendances())
+        load("leads", (
+            "id", "company_name", "contact_person", "email", "source", "status", "estimated_value",
+            "probability", "assigned_to",
+        ), leads())
+        load("activities", (
+            "id", "lead_id", "activity_type", "subject", "date", "duration", "created_by",
+        ), activities())
+
+        reset_sequences(conn)
+        # Rows were loaded without the ORM flush hooks, so recount the derived tables
+        reconcile_counters(conn)
+        if conn.dialect.name == "postgresql":
+            rebuild_waste_rollup(conn)
+            rebuild_material_usage(conn)
+
+    return loaded
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=float, default=0.1, help="1 = 10k SKUs, 1M waste, 5M attendance rows")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="wipe existing data first (required if not empty)")
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        if has_data(conn) and not args.reset:
+            print("Database already contains data; rerun with --reset to replace it")
+            return 1
+
+    print(f"Seeding {engine.url.render_as_string(hide_password=True)} at scale {args.scale:g} (seed {args.seed})")
+    start = time.perf_counter()
+    loaded = seed_database(engine, scale=args.scale, seed=args.seed, log=print)
+    print(f"Loaded {sum(loaded.values()):,} rows in {time.perf_counter() - start:.1f}s")
+    print(f"Admin login: {DEFAULT_ADMIN_USERNAME} / {DEFAULT_ADMIN_PASSWORD}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Async endpoints authenticate through an AsyncSession, so a request to one of
+them never checks out a sync connection. Runs against sqlite+aiosqlite:
+
+    cd backend && python -m pytest -q tests
+"""
+import asyncio
+import os
+import tempfile
+
+# Settings are read at import time, so the environment is set up first
+_database = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_database}",
+    VERIFY_SCHEMA_ON_STARTUP="false",
+    DASHBOARD_RECONCILE_INTERVAL_SECONDS="0",
+    REDIS_URL="",
+    BCRYPT_ROUNDS="4",
+)
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from app.core.security import create_access_token, get_password_hash  # noqa: E402
+from app.crud.user import principal_cache  # noqa: E402
+from app.db.database import Base, SessionLocal, engine, get_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.crm import Lead, LeadSource  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+
+
+def _no_sync_session():
+    raise AssertionError("async endpoint requested a sync database session")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def database():
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        db.add(User(
+            email="sales@example.com",
+            username="sales",
+            full_name="Sales User",
+            hashed_password=get_password_hash("secret"),
+            role=UserRole.SALES,
+        ))
+        db.add(Lead(
+            company_name="Acme Mills",
+            contact_person="Jane Doe",
+            email="jane@acme.example",
+            source=LeadSource.WEBSITE,
+        ))
+        db.commit()
+    app.dependency_overrides[get_db] = _no_sync_session
+    yield
+    app.dependency_overrides.clear()
+    Base.metadata.drop_all(engine)
+
+
+async def _get(path: str, token: str) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path, headers={"Authorization": f"Bearer {token}"})
+
+
+def test_async_endpoint_authenticates_without_sync_session():
+    principal_cache.clear()
+    response = asyncio.run(_get("/api/v1/crm/leads", create_access_token("sales")))
+
+    assert response.status_code == 200
+    assert [lead["company_name"] for lead in response.json()] == ["Acme Mills"]
+
+
+def test_async_endpoint_rejects_unknown_user():
+    principal_cache.clear()
+    response = asyncio.run(_get("/api/v1/crm/leads", create_access_token("nobody")))
+
+    assert response.status_code == 401